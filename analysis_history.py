@@ -0,0 +1,440 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterator, Union
+
+from artifact_store import DEFAULT_STORE_DIR, make_artifact_key
+
+
+DEFAULT_HISTORY_PATH = os.getenv('ANALYSIS_HISTORY_DB', os.path.join(DEFAULT_STORE_DIR, 'history.sqlite'))
+
+# Scalar columns extracted from each analysis for filtering and aggregation
+SUMMARY_COLUMNS = [
+    'analysis_id', 'artifact_key', 'supersedes', 'created_at', 'project_name', 'geography', 'proposed_use', 'naics_code',
+    'multiplier_vintage', 'total_investment', 'funding_request', 'total_jobs_permanent',
+    'total_output', 'roi_ratio', 'payback_years', 'leverage_ratio'
+]
+
+# Columns aggregate() may group by / summarize
+GROUPABLE_COLUMNS = {'geography', 'proposed_use', 'naics_code', 'multiplier_vintage', 'project_name'}
+NUMERIC_COLUMNS = {'total_investment', 'funding_request', 'total_jobs_permanent', 'total_output',
+                   'roi_ratio', 'payback_years', 'leverage_ratio'}
+
+Timestamp = Union[float, int, str, datetime]
+
+
+def _to_epoch(value: Timestamp) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+
+def _json_default(value: Any) -> Any:
+    """Store numpy arrays as JSON lists, numpy scalars as JSON numbers and anything else unknown as text"""
+    if hasattr(value, 'tolist') and getattr(value, 'ndim', 0) > 0:
+        return value.tolist()
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class AnalysisHistory:
+    """
+    History of every analysis, for cross-project queries
+
+    Each record keeps the form inputs, the prepare_llm_context output, the
+    calculator results and the report JSON, plus indexed scalar columns
+    (geography, proposed use, ROI, ...) so filtered and aggregated queries
+    do not need to parse the stored JSON.
+
+    Writes are queued and committed in batches by a background thread, so
+    recording an analysis never blocks the request that produced it. Records
+    are never changed once written: a re-run (e.g. on a new dataset vintage)
+    is appended as a new record that supersedes the original (see
+    supersede), and queries only return the latest record of each analysis.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_HISTORY_PATH, batch_size: int = 500):
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.db_path = db_path
+        self.batch_size = batch_size
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        if db_path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                analysis_id TEXT NOT NULL,
+                artifact_key TEXT,
+                supersedes TEXT,
+                created_at REAL NOT NULL,
+                project_name TEXT,
+                geography TEXT,
+                proposed_use TEXT,
+                naics_code TEXT,
+                multiplier_vintage TEXT,
+                total_investment REAL,
+                funding_request REAL,
+                total_jobs_permanent REAL,
+                total_output REAL,
+                roi_ratio REAL,
+                payback_years REAL,
+                leverage_ratio REAL,
+                form_data TEXT,
+                llm_context TEXT,
+                calculator_results TEXT,
+                report_json TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_analyses_geo_use_date
+                ON analyses(geography, proposed_use, created_at);
+            CREATE INDEX IF NOT EXISTS idx_analyses_created ON analyses(created_at);
+            CREATE INDEX IF NOT EXISTS idx_analyses_roi ON analyses(roi_ratio);
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_analyses_analysis_id ON analyses(analysis_id);
+            CREATE INDEX IF NOT EXISTS idx_analyses_artifact_key ON analyses(artifact_key);
+            CREATE INDEX IF NOT EXISTS idx_analyses_supersedes ON analyses(supersedes);
+        """)
+        self._conn.commit()
+
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    # ----- writes -----
+
+    @staticmethod
+    def build_record(form_data: Dict[str, Any], llm_context: Optional[Dict[str, Any]] = None,
+                     calculator_results: Optional[Dict[str, Any]] = None,
+                     report_json: Optional[Dict[str, Any]] = None,
+                     created_at: Optional[Timestamp] = None, supersedes: Optional[str] = None) -> tuple:
+        """Flatten one analysis into a row for the analyses table"""
+        llm_context = llm_context or {}
+        calculator_results = calculator_results or {}
+        multipliers = llm_context.get('economic_multipliers', {})
+
+        # Every record gets its own id; the artifact key is shared by analyses
+        # with identical context and report, and is only set when there is one
+        analysis_id = uuid.uuid4().hex
+        artifact_key = make_artifact_key(llm_context, report_json) if llm_context or report_json else None
+        total_investment = form_data.get('total_investment', form_data.get('total_development_costs'))
+        funding_request = form_data.get('cra_incentive', form_data.get('funding_request'))
+
+        return (
+            analysis_id,
+            artifact_key,
+            supersedes,
+            _to_epoch(created_at) if created_at is not None else time.time(),
+            form_data.get('project_name') or 'Economic Impact Analysis',
+            llm_context.get('geography', form_data.get('geography', 'homestead')),
+            str(form_data.get('proposed_use', '')).lower().strip(),
+            multipliers.get('naics_code'),
+            multipliers.get('vintage'),
+            _number(total_investment),
+            _number(funding_request),
+            _number(calculator_results.get('total_jobs_permanent')),
+            _number(calculator_results.get('total_output')),
+            _number(calculator_results.get('roi_ratio')),
+            _number(calculator_results.get('payback_years')),
+            _number(calculator_results.get('leverage_ratio')),
+            json.dumps(form_data, default=_json_default),
+            json.dumps(llm_context, default=_json_default),
+            json.dumps(calculator_results, default=_json_default),
+            json.dumps(report_json, default=_json_default) if report_json is not None else None,
+        )
+
+    def append(self, form_data: Dict[str, Any], llm_context: Optional[Dict[str, Any]] = None,
+               calculator_results: Optional[Dict[str, Any]] = None,
+               report_json: Optional[Dict[str, Any]] = None,
+               created_at: Optional[Timestamp] = None, supersedes: Optional[str] = None) -> str:
+        """
+        Queue an analysis for writing and return its id
+
+        The id is unique per record. The artifact_key column holds the
+        artifact store key of the context and report, so history rows can
+        still be matched to stored reports and PDFs.
+        """
+        record = self.build_record(form_data, llm_context, calculator_results, report_json, created_at, supersedes)
+        self._queue.put(record)
+        return record[0]
+
+    def flush(self):
+        """Block until every queued analysis has been committed"""
+        self._queue.join()
+
+    def _write_loop(self):
+        insert = f"""
+            INSERT INTO analyses ({', '.join(SUMMARY_COLUMNS)}, form_data, llm_context,
+                                  calculator_results, report_json)
+            VALUES ({', '.join('?' * (len(SUMMARY_COLUMNS) + 4))})
+        """
+        while True:
+            # Block for the first record, then take whatever else is already
+            # queued so bursts are committed in a single transaction
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                with self._lock:
+                    self._conn.executemany(insert, batch)
+                    self._conn.commit()
+            except Exception as e:
+                print(f"Warning: Failed to write {len(batch)} analyses to history: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def supersede(self, analysis_id: str, llm_context: Dict[str, Any],
+                  calculator_results: Optional[Dict[str, Any]] = None,
+                  report_json: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Append a re-run of a stored analysis and return the new record's id
+
+        The new record keeps the original's form inputs and links back to it
+        through its supersedes column; the original stays as it was, so the
+        results of earlier vintages are never lost. calculator_results and
+        report_json are carried over from the original when not given.
+        Returns None when no analysis has this id.
+        """
+        self.flush()
+        original = self.get(analysis_id)
+        if original is None:
+            return None
+        if calculator_results is None:
+            calculator_results = original['calculator_results']
+        if report_json is None:
+            report_json = original['report_json']
+        return self.append(original['form_data'], llm_context, calculator_results, report_json,
+                           supersedes=analysis_id)
+
+    # ----- queries -----
+
+    @staticmethod
+    def _where(project_name=None, geography=None, proposed_use=None, naics_code=None,
+               min_roi=None, max_payback=None, since=None, until=None, include_superseded=False):
+        clauses = []
+        params = []
+        if not include_superseded:
+            clauses.append("NOT EXISTS (SELECT 1 FROM analyses AS newer WHERE newer.supersedes = analyses.analysis_id)")
+        if project_name is not None:
+            clauses.append("project_name = ?")
+            params.append(project_name)
+        if geography is not None:
+            clauses.append("geography = ?")
+            params.append(geography)
+        if proposed_use is not None:
+            clauses.append("proposed_use = ?")
+            params.append(proposed_use.lower().strip())
+        if naics_code is not None:
+            clauses.append("naics_code = ?")
+            params.append(str(naics_code))
+        if min_roi is not None:
+            clauses.append("roi_ratio > ?")
+            params.append(min_roi)
+        if max_payback is not None:
+            clauses.append("payback_years <= ?")
+            params.append(max_payback)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(_to_epoch(since))
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(_to_epoch(until))
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ''), params
+
+    def query(self, limit: Optional[int] = 1000, include_payloads: bool = False,
+              **filters) -> List[Dict[str, Any]]:
+        """
+        Filter analyses, newest first
+
+        Filters: project_name, geography, proposed_use, naics_code,
+        min_roi (ROI strictly greater than), max_payback, since, until.
+        Superseded records are skipped unless include_superseded is set.
+        Payload columns (form_data, llm_context, calculator_results,
+        report_json) are only loaded and decoded when include_payloads is set.
+
+        Example - restaurant projects in Homestead with ROI > 3 since January:
+            history.query(geography='homestead', proposed_use='restaurant',
+                          min_roi=3, since='2026-01-01')
+        """
+        where, params = self._where(**filters)
+        columns = list(SUMMARY_COLUMNS)
+        if include_payloads:
+            columns += ['form_data', 'llm_context', 'calculator_results', 'report_json']
+
+        sql = f"SELECT {', '.join(columns)} FROM analyses {where} ORDER BY created_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        results = []
+        for row in rows:
+            record = dict(zip(columns, row))
+            if include_payloads:
+                for name in ('form_data', 'llm_context', 'calculator_results', 'report_json'):
+                    record[name] = json.loads(record[name]) if record[name] else None
+            results.append(record)
+        return results
+
+    def get(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        """One record with its payloads decoded, or None; superseded records are still returned"""
+        columns = SUMMARY_COLUMNS + ['form_data', 'llm_context', 'calculator_results', 'report_json']
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(columns)} FROM analyses WHERE analysis_id = ?",
+                                     (analysis_id,)).fetchone()
+        if row is None:
+            return None
+        record = dict(zip(columns, row))
+        for name in ('form_data', 'llm_context', 'calculator_results', 'report_json'):
+            record[name] = json.loads(record[name]) if record[name] else None
+        return record
+
+    def aggregate(self, group_by: str = 'proposed_use', metrics: Optional[List[str]] = None,
+                  **filters) -> List[Dict[str, Any]]:
+        """
+        Count, average and total of numeric columns per group
+
+        Returns rows like {'proposed_use': 'restaurant', 'count': 42,
+        'avg_roi_ratio': 3.4, 'sum_total_investment': ...}.
+        """
+        if group_by not in GROUPABLE_COLUMNS:
+            raise ValueError(f"Cannot group by '{group_by}'")
+        metrics = metrics or ['roi_ratio', 'total_investment', 'total_jobs_permanent']
+        for metric in metrics:
+            if metric not in NUMERIC_COLUMNS:
+                raise ValueError(f"Unknown metric '{metric}'")
+
+        where, params = self._where(**filters)
+        selects = [group_by, "COUNT(*) AS count"]
+        for metric in metrics:
+            selects.append(f"AVG({metric}) AS avg_{metric}")
+            selects.append(f"SUM({metric}) AS sum_{metric}")
+
+        sql = f"SELECT {', '.join(selects)} FROM analyses {where} GROUP BY {group_by} ORDER BY count DESC"
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            names = [description[0] for description in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def count(self, **filters) -> int:
+        where, params = self._where(**filters)
+        with self._lock:
+            return int(self._conn.execute(f"SELECT COUNT(*) FROM analyses {where}", params).fetchone()[0])
+
+    # ----- feeding results back -----
+
+    def iter_analyses(self, batch_size: int = 1000, **filters) -> Iterator[Dict[str, Any]]:
+        """
+        Stream matching analyses, oldest first
+
+        Rows are fetched in batches so large histories can be fed straight
+        back into the calculator or an export without loading them all at once.
+
+        Yields:
+            {'analysis_id', 'geography', 'form_data', 'calculator_results'}
+        """
+        where, params = self._where(**filters)
+        where = f"{where} AND id > ?" if where else "WHERE id > ?"
+        sql = (f"SELECT id, analysis_id, geography, form_data, calculator_results "
+               f"FROM analyses {where} ORDER BY id LIMIT ?")
+
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(sql, [*params, last_id, batch_size]).fetchall()
+            if not rows:
+                break
+            for row_id, analysis_id, geography, form_data, calculator_results in rows:
+                yield {
+                    'analysis_id': analysis_id,
+                    'geography': geography,
+                    'form_data': json.loads(form_data),
+                    'calculator_results': json.loads(calculator_results) if calculator_results else {},
+                }
+            last_id = rows[-1][0]
+
+    def iter_dependencies(self, after_id: int = 0, batch_size: int = 5000) -> Iterator[tuple]:
+        """
+        Stream (row id, analysis_id, geography, naics_code, vintage, supersedes) for rows after `after_id`
+
+        Used to keep a dataset_versions.DependencyIndex in step with the history.
+        """
+        sql = ("SELECT id, analysis_id, geography, naics_code, multiplier_vintage, supersedes "
+               "FROM analyses WHERE id > ? ORDER BY id LIMIT ?")
+        while True:
+            with self._lock:
+                rows = self._conn.execute(sql, (after_id, batch_size)).fetchall()
+            if not rows:
+                break
+            yield from rows
+            after_id = rows[-1][0]
+
+    def rerun_calculator(self, **filters) -> Iterator[Dict[str, Any]]:
+        """
+        Recalculate matching analyses with calculate_economic_impact, yielding fresh results
+
+        Stored form submissions are mapped onto calculator inputs first, so
+        records saved with form keys (total_development_costs, full_time_jobs,
+        ...) and records saved with calculator keys both rerun.
+        """
+        from economic_calculator import calculate_economic_impact, form_to_calculator_inputs
+        for analysis in self.iter_analyses(**filters):
+            inputs = form_to_calculator_inputs(analysis['form_data'], analysis['geography'] or 'homestead')
+            yield {'analysis_id': analysis['analysis_id'], 'inputs': inputs,
+                   'results': calculate_economic_impact(inputs)}
+
+    # ----- analytics snapshots -----
+
+    def export_parquet(self, path: str, include_payloads: bool = False, **filters) -> int:
+        """
+        Write a columnar Parquet snapshot of matching analyses for analytics
+
+        Returns the number of rows written.
+        """
+        import pandas as pd
+
+        where, params = self._where(**filters)
+        columns = list(SUMMARY_COLUMNS)
+        if include_payloads:
+            columns += ['form_data', 'llm_context', 'calculator_results', 'report_json']
+
+        with self._lock:
+            frame = pd.read_sql_query(f"SELECT {', '.join(columns)} FROM analyses {where} ORDER BY id",
+                                      self._conn, params=params)
+        frame['created_at'] = pd.to_datetime(frame['created_at'], unit='s')
+        frame.to_parquet(path, index=False)
+        return len(frame)
+
+
+# Create history lazily so importing this module never touches the filesystem
+_analysis_history = None
+
+
+def get_analysis_history() -> AnalysisHistory:
+    """Returns the shared AnalysisHistory for this process"""
+    global _analysis_history
+    if _analysis_history is None:
+        _analysis_history = AnalysisHistory()
+    return _analysis_history
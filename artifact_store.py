@@ -0,0 +1,294 @@
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional, BinaryIO
+
+
+DEFAULT_STORE_DIR = os.getenv('ARTIFACT_STORE_DIR', '.artifacts')
+
+
+def normalize_for_hash(data: Any) -> str:
+    """Canonical JSON used for hashing: sorted keys, no whitespace, stable numbers"""
+    return json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def make_artifact_key(llm_context: Dict[str, Any], report_json: Optional[Dict[str, Any]]) -> str:
+    """Content address of an analysis: hash of the normalized context and report JSON"""
+    digest = hashlib.sha256()
+    digest.update(normalize_for_hash(llm_context).encode('utf-8'))
+    digest.update(b'\x00')
+    digest.update(normalize_for_hash(report_json).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """
+    Local content-addressed store for generated report JSON and PDFs
+
+    Layout under the store directory:
+        blobs/ab/abcdef...   deduplicated blobs named by the hash of their bytes
+        index.sqlite         artifact metadata (project, geography, date, blob refs)
+
+    Report JSON is gzip-compressed. PDFs are stored as-is: their page streams
+    are already Flate-compressed, and keeping them raw lets downloads be
+    served from the stored file without decompressing it.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = root
+        self.blob_dir = os.path.join(root, 'blobs')
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        # One lock per artifact key, so a PDF is rendered once however many
+        # sessions ask for it at the same time
+        self._render_locks = {}
+        self._conn = sqlite3.connect(os.path.join(root, 'index.sqlite'), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS artifacts (
+                key TEXT PRIMARY KEY,
+                project_name TEXT,
+                geography TEXT,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL,
+                json_blob TEXT,
+                pdf_blob TEXT
+            );
+            CREATE TABLE IF NOT EXISTS blobs (
+                blob TEXT PRIMARY KEY,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_artifacts_project ON artifacts(project_name);
+            CREATE INDEX IF NOT EXISTS idx_artifacts_geography ON artifacts(geography);
+            CREATE INDEX IF NOT EXISTS idx_artifacts_created ON artifacts(created_at);
+        """)
+        self._conn.commit()
+
+    # ----- blobs -----
+
+    def _blob_path(self, blob: str) -> str:
+        return os.path.join(self.blob_dir, blob[:2], blob)
+
+    def _write_blob(self, data: bytes) -> str:
+        """Write bytes once under their own hash; identical content is stored a single time"""
+        blob = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(blob)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as handle:
+                handle.write(data)
+            os.replace(tmp_path, path)
+        self._conn.execute("INSERT OR IGNORE INTO blobs (blob, size) VALUES (?, ?)", (blob, len(data)))
+        return blob
+
+    def _read_blob(self, blob: str) -> bytes:
+        with open(self._blob_path(blob), 'rb') as handle:
+            return handle.read()
+
+    def _touch(self, key: str):
+        self._conn.execute("UPDATE artifacts SET last_accessed = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+
+    # ----- reports -----
+
+    def put_report(self, llm_context: Dict[str, Any], report_json: Dict[str, Any],
+                   project_name: str = '', geography: str = 'homestead') -> str:
+        """
+        Store report JSON for an analysis
+
+        Returns:
+            The artifact key, which is stable for the same context and report
+        """
+        key = make_artifact_key(llm_context, report_json)
+        payload = gzip.compress(normalize_for_hash(report_json).encode('utf-8'), mtime=0)
+        now = time.time()
+
+        with self._lock:
+            json_blob = self._write_blob(payload)
+            self._conn.execute("""
+                INSERT INTO artifacts (key, project_name, geography, created_at, last_accessed, json_blob)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET last_accessed = excluded.last_accessed
+            """, (key, project_name, geography, now, now, json_blob))
+            self._conn.commit()
+        return key
+
+    def get_report(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load stored report JSON, or None if the key is unknown"""
+        with self._lock:
+            row = self._conn.execute("SELECT json_blob FROM artifacts WHERE key = ?", (key,)).fetchone()
+            if not row or not row[0]:
+                return None
+            self._touch(key)
+        return json.loads(gzip.decompress(self._read_blob(row[0])))
+
+    # ----- PDFs -----
+
+    def put_pdf(self, key: str, pdf_bytes: bytes):
+        """Attach rendered PDF bytes to an existing artifact"""
+        with self._lock:
+            pdf_blob = self._write_blob(pdf_bytes)
+            self._conn.execute("UPDATE artifacts SET pdf_blob = ? WHERE key = ?", (pdf_blob, key))
+            self._conn.commit()
+
+    def has_pdf(self, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT pdf_blob FROM artifacts WHERE key = ?", (key,)).fetchone()
+        return bool(row and row[0])
+
+    def open_pdf(self, key: str) -> Optional[BinaryIO]:
+        """
+        Open a stored PDF for streaming
+
+        Returns a read-only file object that can be passed directly to
+        st.download_button, or None if no PDF has been stored for the key.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT pdf_blob FROM artifacts WHERE key = ?", (key,)).fetchone()
+            if not row or not row[0]:
+                return None
+            self._touch(key)
+        return open(self._blob_path(row[0]), 'rb')
+
+    def _render_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._render_locks.setdefault(key, threading.Lock())
+
+    def get_or_render_pdf(self, key: str, project_name: str) -> Optional[BinaryIO]:
+        """
+        Return a stream of the PDF for an artifact, rendering it only once
+
+        The first request renders with generate_pdf_from_json and stores the
+        bytes; every later download streams the stored file. Concurrent
+        requests for the same key wait for that first render instead of
+        rendering again.
+        """
+        with self._render_lock(key):
+            if not self.has_pdf(key):
+                report_json = self.get_report(key)
+                if report_json is None:
+                    return None
+                from pdf_generator import generate_pdf_from_json
+                self.put_pdf(key, generate_pdf_from_json(report_json, project_name))
+        return self.open_pdf(key)
+
+    # ----- queries -----
+
+    def find(self, project_name: Optional[str] = None, geography: Optional[str] = None,
+             since: Optional[float] = None, until: Optional[float] = None,
+             limit: int = 100) -> List[Dict[str, Any]]:
+        """Look up artifact metadata by project, geography and creation time (epoch seconds)"""
+        clauses = []
+        params = []
+        if project_name is not None:
+            clauses.append("project_name = ?")
+            params.append(project_name)
+        if geography is not None:
+            clauses.append("geography = ?")
+            params.append(geography)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self._lock:
+            rows = self._conn.execute(f"""
+                SELECT key, project_name, geography, created_at, pdf_blob IS NOT NULL
+                FROM artifacts {where}
+                ORDER BY created_at DESC LIMIT ?
+            """, (*params, limit)).fetchall()
+
+        return [
+            {'key': key, 'project_name': project, 'geography': geo,
+             'created_at': created, 'has_pdf': bool(has_pdf)}
+            for key, project, geo, created, has_pdf in rows
+        ]
+
+    # ----- garbage collection -----
+
+    def total_size(self) -> int:
+        """Bytes currently held in blobs"""
+        with self._lock:
+            return self._total_size()
+
+    def _total_size(self) -> int:
+        """Caller holds the lock."""
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        return int(row[0])
+
+    def collect_garbage(self, max_age_days: Optional[float] = None,
+                        max_bytes: Optional[int] = None) -> Dict[str, int]:
+        """
+        Evict artifacts by age and total size, then delete unreferenced blobs
+
+        Args:
+            max_age_days: Drop artifacts not accessed within this many days
+            max_bytes: Evict least recently accessed artifacts until blobs fit
+
+        Returns:
+            Counts of removed artifacts and blobs, and bytes freed
+        """
+        removed_artifacts = 0
+        with self._lock:
+            if max_age_days is not None:
+                cutoff = time.time() - max_age_days * 86400
+                cursor = self._conn.execute("DELETE FROM artifacts WHERE last_accessed < ?", (cutoff,))
+                removed_artifacts += cursor.rowcount
+
+            removed_blobs, freed = self._sweep_blobs()
+
+            if max_bytes is not None:
+                size = self._total_size()
+                oldest = self._conn.execute(
+                    "SELECT key FROM artifacts ORDER BY last_accessed ASC").fetchall()
+                for (key,) in oldest:
+                    if size <= max_bytes:
+                        break
+                    self._conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+                    removed_artifacts += 1
+                    swept, swept_bytes = self._sweep_blobs()
+                    removed_blobs += swept
+                    freed += swept_bytes
+                    size -= swept_bytes
+
+            self._conn.commit()
+
+        return {'artifacts_removed': removed_artifacts, 'blobs_removed': removed_blobs,
+                'bytes_freed': freed}
+
+    def _sweep_blobs(self):
+        """Delete blobs no artifact refers to. Caller holds the lock."""
+        orphans = self._conn.execute("""
+            SELECT blob, size FROM blobs
+            WHERE blob NOT IN (SELECT json_blob FROM artifacts WHERE json_blob IS NOT NULL)
+              AND blob NOT IN (SELECT pdf_blob FROM artifacts WHERE pdf_blob IS NOT NULL)
+        """).fetchall()
+
+        freed = 0
+        for blob, size in orphans:
+            try:
+                os.remove(self._blob_path(blob))
+            except FileNotFoundError:
+                pass
+            self._conn.execute("DELETE FROM blobs WHERE blob = ?", (blob,))
+            freed += size
+        return len(orphans), freed
+
+
+# Create store lazily so importing this module never touches the filesystem
+_artifact_store = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Returns the shared ArtifactStore for this process"""
+    global _artifact_store
+    if _artifact_store is None:
+        _artifact_store = ArtifactStore()
+    return _artifact_store
@@ -0,0 +1,285 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from html import escape
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from artifact_store import normalize_for_hash
+
+
+# Report palette: primary blue, secondary red, then supporting tones
+PALETTE = ['#1f4788', '#c41e3a', '#2c5aa0', '#7a9cc6', '#f2a541', '#5b8c5a']
+
+CHART_WIDTH = 640
+CHART_HEIGHT = 260
+MARGIN = {'top': 20, 'right': 20, 'bottom': 40, 'left': 80}
+
+_CACHE_SIZE = 256
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {'hits': 0, 'misses': 0}
+
+
+def _memoized(kind: str, render, **params) -> str:
+    """Return a cached SVG fragment for identical chart data, rendering on a miss"""
+    key = hashlib.sha256(normalize_for_hash([kind, params]).encode('utf-8')).hexdigest()
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            _cache_stats['hits'] += 1
+            return _cache[key]
+        _cache_stats['misses'] += 1
+
+    svg = render(**params)
+
+    with _cache_lock:
+        _cache[key] = svg
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return svg
+
+
+def cache_info() -> Dict[str, int]:
+    """Hit/miss counts and current size of the chart fragment cache"""
+    with _cache_lock:
+        return {**_cache_stats, 'size': len(_cache)}
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+        _cache_stats['hits'] = 0
+        _cache_stats['misses'] = 0
+
+
+# ----- shared drawing helpers -----
+
+def _format_value(value: float, currency: bool) -> str:
+    prefix = '$' if currency else ''
+    magnitude = abs(value)
+    if magnitude >= 1_000_000:
+        return f"{prefix}{value / 1_000_000:,.1f}M"
+    if magnitude >= 1_000:
+        return f"{prefix}{value / 1_000:,.0f}K"
+    return f"{prefix}{value:,.0f}" if currency else f"{value:,.1f}"
+
+
+def _nice_max(value: float) -> float:
+    """Round an axis maximum up to 1, 2, 2.5 or 5 times a power of ten"""
+    if value <= 0:
+        return 1.0
+    exponent = 10 ** (len(str(int(value))) - 1)
+    for step in (1, 2, 2.5, 5, 10):
+        if value <= step * exponent:
+            return step * exponent
+    return 10 * exponent
+
+
+def _frame(title: str, y_min: float, y_max: float, currency: bool) -> Tuple[List[str], Any]:
+    """Open an SVG with gridlines and a y axis; returns parts and a y-to-pixel mapper"""
+    plot_height = CHART_HEIGHT - MARGIN['top'] - MARGIN['bottom']
+    plot_right = CHART_WIDTH - MARGIN['right']
+    span = (y_max - y_min) or 1.0
+
+    def y_pos(value: float) -> float:
+        return MARGIN['top'] + plot_height * (1 - (value - y_min) / span)
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{CHART_WIDTH}" height="{CHART_HEIGHT}" '
+        f'viewBox="0 0 {CHART_WIDTH} {CHART_HEIGHT}" font-family="Arial, sans-serif" font-size="9">',
+        f'<title>{escape(title)}</title>',
+    ]
+    for i in range(5):
+        value = y_min + span * i / 4
+        y = y_pos(value)
+        parts.append(f'<line x1="{MARGIN["left"]}" y1="{y:.1f}" x2="{plot_right}" y2="{y:.1f}" stroke="#e0e0e0"/>')
+        parts.append(f'<text x="{MARGIN["left"] - 6}" y="{y + 3:.1f}" text-anchor="end" fill="#666">'
+                     f'{_format_value(value, currency)}</text>')
+    return parts, y_pos
+
+
+def _legend(series_names: Sequence[str]) -> List[str]:
+    parts = []
+    x = MARGIN['left']
+    y = CHART_HEIGHT - 10
+    for i, name in enumerate(series_names):
+        color = PALETTE[i % len(PALETTE)]
+        parts.append(f'<rect x="{x}" y="{y - 8}" width="10" height="10" fill="{color}"/>')
+        parts.append(f'<text x="{x + 14}" y="{y}" fill="#333">{escape(str(name))}</text>')
+        x += 24 + 6 * len(str(name))
+    return parts
+
+
+def _x_labels(labels: Sequence[Any], centers: Sequence[float]) -> List[str]:
+    y = CHART_HEIGHT - MARGIN['bottom'] + 14
+    return [f'<text x="{x:.1f}" y="{y}" text-anchor="middle" fill="#333">{escape(str(label))}</text>'
+            for label, x in zip(labels, centers)]
+
+
+# ----- renderers -----
+
+def _render_line(title, labels, series, currency):
+    values = [v for points in series.values() for v in points]
+    parts, y_pos = _frame(title, 0, _nice_max(max(values, default=0)), currency)
+
+    plot_width = CHART_WIDTH - MARGIN['left'] - MARGIN['right']
+    step = plot_width / max(len(labels) - 1, 1)
+    xs = [MARGIN['left'] + step * i for i in range(len(labels))]
+
+    for i, (name, points) in enumerate(series.items()):
+        color = PALETTE[i % len(PALETTE)]
+        path = ' '.join(f'{x:.1f},{y_pos(v):.1f}' for x, v in zip(xs, points))
+        parts.append(f'<polyline points="{path}" fill="none" stroke="{color}" stroke-width="2"/>')
+        for x, v in zip(xs, points):
+            parts.append(f'<circle cx="{x:.1f}" cy="{y_pos(v):.1f}" r="2.5" fill="{color}"/>')
+
+    parts.extend(_x_labels(labels, xs))
+    parts.extend(_legend(list(series)))
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+def _render_stacked_bar(title, labels, series, currency):
+    totals = [sum(points[i] for points in series.values()) for i in range(len(labels))]
+    parts, y_pos = _frame(title, 0, _nice_max(max(totals, default=0)), currency)
+
+    plot_width = CHART_WIDTH - MARGIN['left'] - MARGIN['right']
+    slot = plot_width / max(len(labels), 1)
+    bar_width = slot * 0.5
+    centers = [MARGIN['left'] + slot * (i + 0.5) for i in range(len(labels))]
+
+    for i, center in enumerate(centers):
+        base = 0.0
+        for s, points in enumerate(series.values()):
+            value = max(points[i], 0)
+            top = y_pos(base + value)
+            height = y_pos(base) - top
+            parts.append(f'<rect x="{center - bar_width / 2:.1f}" y="{top:.1f}" width="{bar_width:.1f}" '
+                         f'height="{height:.1f}" fill="{PALETTE[s % len(PALETTE)]}"/>')
+            base += value
+        parts.append(f'<text x="{center:.1f}" y="{y_pos(base) - 4:.1f}" text-anchor="middle" fill="#333">'
+                     f'{_format_value(base, currency)}</text>')
+
+    parts.extend(_x_labels(labels, centers))
+    parts.extend(_legend(list(series)))
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+def _render_waterfall(title, labels, values, currency):
+    running = 0.0
+    spans = []
+    for value in values:
+        spans.append((running, running + value))
+        running += value
+    spans.append((0.0, running))
+
+    low = min(min(start, end) for start, end in spans)
+    high = max(max(start, end) for start, end in spans)
+    parts, y_pos = _frame(title, min(low, 0), _nice_max(high), currency)
+
+    all_labels = list(labels) + ['Total']
+    plot_width = CHART_WIDTH - MARGIN['left'] - MARGIN['right']
+    slot = plot_width / max(len(all_labels), 1)
+    bar_width = slot * 0.6
+    centers = [MARGIN['left'] + slot * (i + 0.5) for i in range(len(all_labels))]
+
+    for i, ((start, end), center) in enumerate(zip(spans, centers)):
+        is_total = i == len(spans) - 1
+        color = PALETTE[0] if is_total else (PALETTE[2] if end >= start else PALETTE[1])
+        top = y_pos(max(start, end))
+        height = max(abs(y_pos(start) - y_pos(end)), 0.5)
+        parts.append(f'<rect x="{center - bar_width / 2:.1f}" y="{top:.1f}" width="{bar_width:.1f}" '
+                     f'height="{height:.1f}" fill="{color}"/>')
+        parts.append(f'<text x="{center:.1f}" y="{top - 4:.1f}" text-anchor="middle" fill="#333">'
+                     f'{_format_value(end - start, currency)}</text>')
+        if not is_total:
+            next_x = centers[i + 1] - bar_width / 2
+            parts.append(f'<line x1="{center + bar_width / 2:.1f}" y1="{y_pos(end):.1f}" '
+                         f'x2="{next_x:.1f}" y2="{y_pos(end):.1f}" stroke="#999" stroke-dasharray="2,2"/>')
+
+    parts.extend(_x_labels(all_labels, centers))
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+# ----- public API -----
+
+def line_chart(title: str, labels: Sequence[Any], series: Dict[str, Sequence[float]],
+               currency: bool = True) -> str:
+    """
+    Inline SVG line chart
+
+    Args:
+        title: Accessible chart title
+        labels: X-axis labels (e.g. years)
+        series: Series name -> values aligned with labels
+        currency: Format the y axis as dollars
+    """
+    return _memoized('line', _render_line, title=title, labels=list(labels),
+                     series={name: [float(v or 0) for v in points] for name, points in series.items()},
+                     currency=currency)
+
+
+def stacked_bar_chart(title: str, labels: Sequence[Any], series: Dict[str, Sequence[float]],
+                      currency: bool = False) -> str:
+    """Inline SVG stacked bar chart; each series is one stacked segment per label"""
+    return _memoized('stacked_bar', _render_stacked_bar, title=title, labels=list(labels),
+                     series={name: [float(v or 0) for v in points] for name, points in series.items()},
+                     currency=currency)
+
+
+def waterfall_chart(title: str, labels: Sequence[Any], values: Sequence[float],
+                    currency: bool = True) -> str:
+    """Inline SVG waterfall chart: each step adds to the running total, ending in a Total bar"""
+    return _memoized('waterfall', _render_waterfall, title=title, labels=list(labels),
+                     values=[float(v or 0) for v in values], currency=currency)
+
+
+def _impact_rows(section: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Index a construction/operations table by impact type, excluding the Total row"""
+    return {row.get('impact_type'): row for row in section.get('table', [])
+            if row.get('impact_type') and row.get('impact_type') != 'Total'}
+
+
+def build_report_charts(report_data: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """
+    Build the SVG charts for a report JSON
+
+    Returns:
+        {'cra_increment': svg, 'job_composition': svg, 'operations_output': svg};
+        a chart is None when the report has no data for it
+    """
+    charts = {'cra_increment': None, 'job_composition': None, 'operations_output': None}
+
+    cra_projection = report_data.get('cra_increment_projection', [])
+    if cra_projection:
+        charts['cra_increment'] = line_chart(
+            'CRA Tax Increment by Year',
+            [row.get('year', '') for row in cra_projection],
+            {
+                'Annual CRA Increment': [row.get('cra_increment', 0) for row in cra_projection],
+                'Cumulative': [row.get('cumulative', 0) for row in cra_projection],
+            },
+        )
+
+    construction = _impact_rows(report_data.get('construction_impact', {}))
+    operations = _impact_rows(report_data.get('operations_impact', {}))
+    impact_types = list(dict.fromkeys(list(construction) + list(operations)))
+    if impact_types:
+        charts['job_composition'] = stacked_bar_chart(
+            'Job Composition by Phase',
+            ['Construction (One-Time)', 'Operations (Annual)'],
+            {impact: [construction.get(impact, {}).get('jobs', 0),
+                      operations.get(impact, {}).get('jobs', 0)]
+             for impact in impact_types},
+        )
+
+    if operations:
+        charts['operations_output'] = waterfall_chart(
+            'Annual Economic Output Build-Up',
+            list(operations),
+            [row.get('output', row.get('economic_output', 0)) for row in operations.values()],
+        )
+
+    return charts
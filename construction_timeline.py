@@ -0,0 +1,227 @@
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+from scipy.special import betainc
+
+from economic_calculator import DEFAULT_JOB_YEARS_PER_MILLION, DEFAULT_CONSTRUCTION_WAGE
+
+
+HOURS_PER_MONTH = 2080 / 12
+
+# Cumulative spend curves as (shape a, shape b) of a Beta distribution over
+# the construction period. (2, 2) is the classic symmetric S-curve; soft costs
+# (design, permits, fees) are front-loaded.
+S_CURVES = {
+    'linear': (1.0, 1.0),
+    's_curve': (2.0, 2.0),
+    'steep_s_curve': (3.0, 3.0),
+    'front_loaded': (1.5, 3.0),
+    'back_loaded': (3.0, 1.5),
+}
+
+DEFAULT_HARD_COST_CURVE = 's_curve'
+DEFAULT_SOFT_COST_CURVE = 'front_loaded'
+
+
+def _curve_params(curve: Any) -> Tuple[float, float]:
+    if isinstance(curve, str):
+        if curve not in S_CURVES:
+            raise ValueError(f"Unknown S-curve '{curve}'. Choose from: {', '.join(S_CURVES)}")
+        return S_CURVES[curve]
+    a, b = curve
+    return float(a), float(b)
+
+
+def monthly_weights(durations: np.ndarray, curve: Any = DEFAULT_HARD_COST_CURVE,
+                    months: Optional[int] = None) -> np.ndarray:
+    """
+    Share of total spend falling in each month, for many projects at once
+
+    Args:
+        durations: Construction duration in months per project
+        curve: Name from S_CURVES or an (a, b) Beta shape pair
+        months: Width of the output; defaults to the longest duration
+
+    Returns:
+        Array of shape (projects, months); each row sums to 1 over the
+        project's own duration and is zero afterwards
+    """
+    a, b = _curve_params(curve)
+    durations = np.maximum(np.asarray(durations, dtype=float), 1.0)
+    if months is None:
+        months = int(np.ceil(durations.max())) if durations.size else 0
+
+    edges = np.arange(months + 1, dtype=float)[None, :] / durations[:, None]
+    cumulative = betainc(a, b, np.clip(edges, 0.0, 1.0))
+    return np.diff(cumulative, axis=1)
+
+
+def _component_split(multiplier: np.ndarray, indirect: np.ndarray, induced: np.ndarray):
+    """Split a total multiplier's ripple effect (multiplier - 1) into indirect and induced parts"""
+    ripple = np.maximum(multiplier - 1.0, 0.0)
+    share_total = indirect + induced
+    indirect_share = np.where(share_total > 0, indirect / np.where(share_total > 0, share_total, 1.0), 0.5)
+    return ripple * indirect_share, ripple * (1.0 - indirect_share)
+
+
+def _lag(values: np.ndarray, months: int) -> np.ndarray:
+    if months <= 0:
+        return values
+    lagged = np.zeros_like(values)
+    lagged[:, months:] = values[:, :-months]
+    return lagged
+
+
+def build_timeline_inputs(projects: List[Dict[str, Any]], geography: str = "homestead") -> Dict[str, np.ndarray]:
+    """
+    Stack form submissions into arrays for construction_timelines
+
+    Multipliers come from the project dict when present (calculator-style
+    keys), otherwise from DataProcessor for the project's proposed use.
+    """
+    from data_processor import data_processor
+
+    columns = {name: [] for name in (
+        'hard_costs', 'soft_costs', 'construction_duration', 'construction_jobs', 'construction_avg_wage',
+        'output_multiplier', 'employment_multiplier', 'earnings_multiplier',
+        'indirect_multiplier', 'induced_multiplier')}
+
+    for project in projects:
+        multipliers = data_processor.get_relevant_multipliers(
+            project.get('proposed_use') or 'restaurant', project.get('geography', geography))
+        hard_costs = float(project.get('hard_costs') or 0)
+        soft_costs = float(project.get('soft_costs') or 0)
+        if not hard_costs and not soft_costs:
+            # Fall back to the total when the split is unknown
+            hard_costs = float(project.get('total_development_costs') or project.get('total_investment') or 0)
+
+        columns['hard_costs'].append(hard_costs)
+        columns['soft_costs'].append(soft_costs)
+        columns['construction_duration'].append(float(project.get('construction_duration') or 12))
+        columns['construction_jobs'].append(float(project.get('construction_jobs') or 0))
+        columns['construction_avg_wage'].append(float(project.get('construction_avg_wage') or DEFAULT_CONSTRUCTION_WAGE))
+        columns['output_multiplier'].append(float(project.get('output_multiplier') or multipliers['output_multiplier']))
+        columns['employment_multiplier'].append(float(project.get('employment_multiplier') or multipliers['employment_multiplier']))
+        columns['earnings_multiplier'].append(float(project.get('income_multiplier') or multipliers['earnings_multiplier']))
+        columns['indirect_multiplier'].append(float(multipliers['indirect_multiplier']))
+        columns['induced_multiplier'].append(float(multipliers['induced_multiplier']))
+
+    return {name: np.array(values, dtype=float) for name, values in columns.items()}
+
+
+def construction_timelines(inputs: Dict[str, np.ndarray], hard_cost_curve: Any = DEFAULT_HARD_COST_CURVE,
+                           soft_cost_curve: Any = DEFAULT_SOFT_COST_CURVE,
+                           job_years_per_million: float = DEFAULT_JOB_YEARS_PER_MILLION,
+                           induced_lag_months: int = 0) -> Dict[str, Any]:
+    """
+    Monthly construction-phase spend, jobs, income and output for many projects
+
+    Hard and soft costs are spread over each project's construction_duration
+    along their S-curves. Direct construction employment follows hard-cost
+    spend: the project's construction_jobs (average FTEs over the period)
+    when given, otherwise job_years_per_million of hard costs. Indirect and
+    induced effects split each multiplier's ripple (multiplier - 1) in
+    proportion to the indirect and induced multipliers.
+
+    Induced effects are shifted induced_lag_months later; the month grid is
+    widened by the lag so none fall off its end.
+
+    Returns:
+        'monthly': dict of (projects, months) arrays - spend, direct/indirect/
+            induced/total jobs, income and output, cumulative_spend
+        'peak': dict of per-project arrays - peak month (1-based), peak
+            spend, peak total jobs, month cumulative spend passes 50%
+    """
+    durations = inputs['construction_duration']
+    if durations.size == 0:
+        return _empty_timelines()
+    # Widen the grid so induced effects lagged past the last build month are kept
+    months = int(np.ceil(np.maximum(durations, 1.0).max())) + max(int(induced_lag_months), 0)
+
+    hard_weights = monthly_weights(durations, hard_cost_curve, months)
+    soft_weights = monthly_weights(durations, soft_cost_curve, months)
+    hard_spend = hard_weights * inputs['hard_costs'][:, None]
+    soft_spend = soft_weights * inputs['soft_costs'][:, None]
+    spend = hard_spend + soft_spend
+
+    job_months = np.where(
+        inputs['construction_jobs'] > 0,
+        inputs['construction_jobs'] * durations,
+        inputs['hard_costs'] / 1_000_000 * job_years_per_million * 12,
+    )
+    direct_jobs = hard_weights * job_months[:, None]
+    direct_income = direct_jobs * HOURS_PER_MONTH * inputs['construction_avg_wage'][:, None]
+    direct_output = spend
+
+    indirect, induced = inputs['indirect_multiplier'], inputs['induced_multiplier']
+    monthly = {'spend': spend, 'hard_cost_spend': hard_spend, 'soft_cost_spend': soft_spend}
+    for name, direct, multiplier in (
+        ('jobs', direct_jobs, inputs['employment_multiplier']),
+        ('income', direct_income, inputs['earnings_multiplier']),
+        ('output', direct_output, inputs['output_multiplier']),
+    ):
+        indirect_rate, induced_rate = _component_split(multiplier, indirect, induced)
+        monthly[f'direct_{name}'] = direct
+        monthly[f'indirect_{name}'] = direct * indirect_rate[:, None]
+        monthly[f'induced_{name}'] = _lag(direct * induced_rate[:, None], induced_lag_months)
+        monthly[f'total_{name}'] = monthly[f'direct_{name}'] + monthly[f'indirect_{name}'] + monthly[f'induced_{name}']
+
+    cumulative_spend = np.cumsum(spend, axis=1)
+    monthly['cumulative_spend'] = cumulative_spend
+
+    total_spend = cumulative_spend[:, -1]
+    halfway = cumulative_spend >= (total_spend[:, None] / 2)
+    peak_month = np.argmax(spend, axis=1)
+    rows = np.arange(len(durations))
+
+    peak = {
+        'peak_month': peak_month + 1,
+        'peak_spend': spend[rows, peak_month],
+        'peak_jobs_month': np.argmax(monthly['total_jobs'], axis=1) + 1,
+        'peak_total_jobs': monthly['total_jobs'].max(axis=1),
+        'peak_direct_jobs': direct_jobs.max(axis=1),
+        'midpoint_month': np.argmax(halfway, axis=1) + 1,
+        'total_spend': total_spend,
+    }
+
+    return {'months': months, 'monthly': monthly, 'peak': peak}
+
+
+MONTHLY_SERIES = ['spend', 'hard_cost_spend', 'soft_cost_spend'] + [
+    f'{component}_{name}' for name in ('jobs', 'income', 'output')
+    for component in ('direct', 'indirect', 'induced', 'total')] + ['cumulative_spend']
+
+PEAK_STATS = ['peak_month', 'peak_spend', 'peak_jobs_month', 'peak_total_jobs', 'peak_direct_jobs',
+              'midpoint_month', 'total_spend']
+
+
+def _empty_timelines() -> Dict[str, Any]:
+    """construction_timelines output for an empty portfolio"""
+    return {
+        'months': 0,
+        'monthly': {name: np.zeros((0, 0)) for name in MONTHLY_SERIES},
+        'peak': {name: np.zeros(0, dtype=int if name.endswith('month') else float) for name in PEAK_STATS},
+    }
+
+
+def project_timeline(form_data: Dict[str, Any], geography: str = "homestead", **options) -> Dict[str, Any]:
+    """
+    Construction timeline for a single form submission
+
+    Returns:
+        {'monthly': [{'month': 1, 'spend': ..., 'total_jobs': ..., ...}, ...],
+         'peak': {...}} trimmed to the project's own duration
+    """
+    timelines = construction_timelines(build_timeline_inputs([form_data], geography), **options)
+    duration = int(np.ceil(max(float(form_data.get('construction_duration') or 12), 1.0)))
+
+    rows = []
+    for month in range(duration):
+        row = {'month': month + 1}
+        for name, values in timelines['monthly'].items():
+            row[name] = float(values[0, month])
+        rows.append(row)
+
+    peak = {name: (int(values[0]) if name.endswith('month') else float(values[0]))
+            for name, values in timelines['peak'].items()}
+    return {'monthly': rows, 'peak': peak}
@@ -8,6 +8,13 @@ class DataProcessor:
     """
 
     def __init__(self):
+        # Vintage of each geography's multiplier table below; recorded with every
+        # analysis so results can be traced back to the dataset they were built from
+        self.multiplier_vintages = {
+            'homestead': 'Lightcast 2025',
+            'florida_statewide': 'Lightcast 2025'
+        }
+
         # ===== HOMESTEAD CRA DATA =====
         # Hard-coded multipliers from Lightcast data for Homestead
         self.multipliers_by_industry = {
@@ -256,6 +263,40 @@ class DataProcessor:
         print(f"Warning: Industry '{industry_type}' not found, defaulting to restaurant")
         return multiplier_set['restaurant']
 
+    def get_multiplier_tables(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """All multiplier sets keyed by geography"""
+        return {
+            'homestead': self.multipliers_by_industry,
+            'florida_statewide': self.florida_statewide_multipliers
+        }
+
+    def get_multiplier_vintage(self, geography: str = "homestead", multipliers: Dict[str, Any] = None) -> str:
+        """
+        Vintage of a geography's multiplier table, or of one industry's entry in it
+
+        Entries replaced by apply_multipliers carry their own vintage; the
+        others are still on the table's original one.
+        """
+        if multipliers and multipliers.get('vintage'):
+            return multipliers['vintage']
+        return self.multiplier_vintages['florida_statewide' if geography == 'florida_statewide' else 'homestead']
+
+    def apply_multipliers(self, geography: str, multipliers_by_naics: Dict[str, Dict[str, Any]], vintage: str):
+        """
+        Load a new vintage of multipliers for a geography
+
+        Industries are matched on NAICS code; each matched entry is replaced
+        with a copy carrying the new values and vintage, so contexts prepared
+        earlier keep the numbers they were built from. Industries the new
+        vintage does not cover keep their values and their old vintage.
+        """
+        table = self.get_multiplier_tables()[geography]
+        for industry, multipliers in table.items():
+            new_values = multipliers_by_naics.get(str(multipliers['naics_code']))
+            if new_values:
+                table[industry] = {**multipliers, **new_values, 'naics_code': multipliers['naics_code'],
+                                   'vintage': vintage}
+
     def get_demographics(self, geography: str = "homestead") -> Dict[str, Any]:
         """Get demographic data for the specified geography"""
         if geography == "florida_statewide":
@@ -325,11 +366,11 @@ class DataProcessor:
 
         # Determine source labels based on geography
         if geography == "florida_statewide":
-            multiplier_source = 'Lightcast 2025 data for Florida statewide'
+            multiplier_source = f"{self.get_multiplier_vintage(geography, multipliers)} data for Florida statewide"
             demo_source = 'US Census 2024 data for Florida'
             real_estate_source = 'CoStar 2025 Florida statewide averages'
         else:
-            multiplier_source = 'Lightcast 2025 data for Homestead/South Dade region'
+            multiplier_source = f"{self.get_multiplier_vintage(geography, multipliers)} data for Homestead/South Dade region"
             demo_source = 'Esri 2025 demographics for Homestead, FL'
             real_estate_source = 'CoStar 2025 data for Homestead retail/restaurant market'
 
@@ -346,6 +387,7 @@ class DataProcessor:
                 'earnings_multiplier': multipliers['earnings_multiplier'],
                 'indirect_multiplier': multipliers['indirect_multiplier'],
                 'induced_multiplier': multipliers['induced_multiplier'],
+                'vintage': self.get_multiplier_vintage(geography, multipliers),
                 'note': multiplier_source
             },
             'demographics': {
@@ -0,0 +1,432 @@
+import csv
+import os
+import sqlite3
+import threading
+from typing import Dict, Any, List, Optional, Iterable, Tuple, Callable, Set
+
+from artifact_store import DEFAULT_STORE_DIR
+
+
+DEFAULT_DEPENDENCY_PATH = os.getenv('DEPENDENCY_INDEX_DB', os.path.join(DEFAULT_STORE_DIR, 'dependencies.sqlite'))
+
+# (geography, naics_code)
+DatasetKey = Tuple[str, str]
+
+# Multiplier fields every snapshot carries, in DataProcessor's names. Only
+# these are compared between vintages.
+MULTIPLIER_FIELDS = ['output_multiplier', 'employment_multiplier', 'earnings_multiplier',
+                     'indirect_multiplier', 'induced_multiplier']
+
+
+def _float(value: Any) -> float:
+    return float(str(value).replace(',', '').strip() or 0)
+
+
+def lightcast_multipliers(row: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Map a Lightcast Regional Multipliers row onto DataProcessor's multiplier fields
+
+    Lightcast reports each effect per dollar of initial sales: Total Sales is
+    1 + Direct + Indirect + Induced, where "Direct" is the first round of
+    supplier purchases. DataProcessor's indirect multiplier covers the whole
+    supply chain (Direct + Indirect) and its induced multiplier the household
+    spending round.
+    """
+    return {
+        'output_multiplier': _float(row['Total Sales']),
+        'employment_multiplier': _float(row['Total Jobs']),
+        'earnings_multiplier': _float(row['Total Earnings']),
+        'indirect_multiplier': _float(row['Direct Sales']) + _float(row['Indirect Sales']),
+        'induced_multiplier': _float(row['Induced Sales']),
+    }
+
+
+class DatasetSnapshot:
+    """
+    Vintage-tagged, immutable view of a multiplier dataset
+
+    Records are keyed by (geography, NAICS code) and hold industry_name plus
+    MULTIPLIER_FIELDS, whichever loader produced them. A snapshot can be
+    taken from the tables DataProcessor holds in memory, or loaded from a
+    Lightcast "Regional Multipliers" CSV export when a new vintage arrives.
+    A record may carry its own 'vintage' when the tables mix vintages (an
+    industry the last export did not cover); otherwise it is on `vintage`.
+    """
+
+    def __init__(self, vintage: str, records: Dict[DatasetKey, Dict[str, Any]]):
+        self.vintage = vintage
+        self.records = {key: dict(values) for key, values in records.items()}
+
+    @property
+    def geographies(self) -> Set[str]:
+        return {geography for geography, _ in self.records}
+
+    def vintage_of(self, key: DatasetKey) -> str:
+        return self.records[key].get('vintage') or self.vintage
+
+    @classmethod
+    def from_data_processor(cls, processor: Any, geographies: Optional[Iterable[str]] = None,
+                            vintage: Optional[str] = None) -> 'DatasetSnapshot':
+        """
+        Snapshot the multiplier tables currently loaded in a DataProcessor
+
+        Every record keeps the vintage of the entry it was taken from. The
+        snapshot's own vintage is `vintage` if given, otherwise the records'
+        common vintage (or all of them, comma separated, when they differ).
+        """
+        tables = processor.get_multiplier_tables()
+        geographies = list(geographies) if geographies is not None else list(tables)
+
+        records = {}
+        for geography in geographies:
+            for multipliers in tables[geography].values():
+                values = {name: multipliers[name] for name in MULTIPLIER_FIELDS}
+                values['industry_name'] = multipliers.get('industry_name', '')
+                values['vintage'] = processor.get_multiplier_vintage(geography, multipliers)
+                records[(geography, str(multipliers['naics_code']))] = values
+        if vintage is None:
+            vintage = ', '.join(sorted({values['vintage'] for values in records.values()}))
+        return cls(vintage, records)
+
+    @classmethod
+    def from_csv(cls, path: str, geography: str, vintage: str) -> 'DatasetSnapshot':
+        """Load a Lightcast Regional Multipliers export (e.g. data/Homestead/Regional Multipliers.csv)"""
+        records = {}
+        with open(path, newline='', encoding='utf-8-sig') as handle:
+            for row in csv.DictReader(handle):
+                naics = (row.get('NAICS') or '').strip()
+                if not naics:
+                    continue
+                try:
+                    values = lightcast_multipliers(row)
+                except (KeyError, ValueError) as e:
+                    raise ValueError(f"Unreadable multipliers for NAICS {naics} in {path}: {e}")
+                values['industry_name'] = (row.get('Industry') or '').strip()
+                records[(geography, naics)] = values
+        return cls(vintage, records)
+
+    def merge(self, other: 'DatasetSnapshot') -> 'DatasetSnapshot':
+        """Combine snapshots of different geographies, keeping each record's vintage"""
+        records = {key: {**values, 'vintage': snapshot.vintage_of(key)}
+                   for snapshot in (self, other) for key, values in snapshot.records.items()}
+        return DatasetSnapshot(self.vintage, records)
+
+    def multipliers_for(self, geography: str) -> Dict[str, Dict[str, Any]]:
+        """{naics: multiplier fields} for one geography"""
+        return {naics: {name: values[name] for name in MULTIPLIER_FIELDS}
+                for (record_geography, naics), values in self.records.items() if record_geography == geography}
+
+
+def diff_snapshots(old: DatasetSnapshot, new: DatasetSnapshot,
+                   tolerance: float = 0.0) -> Dict[str, Set[DatasetKey]]:
+    """
+    Report exactly which (geography, NAICS) keys differ between two vintages
+
+    Only geographies present in `new` are compared, so loading a new vintage
+    for one geography never invalidates analyses of another. Multipliers
+    within `tolerance` of each other count as unchanged, so re-exports with
+    rounding noise do not invalidate results; industry names are ignored.
+
+    Returns:
+        {'added': {...}, 'removed': {...}, 'changed': {...}}
+    """
+    geographies = new.geographies
+    old_keys = {key for key in old.records if key[0] in geographies}
+    new_keys = set(new.records)
+    changed = set()
+
+    for key in old_keys & new_keys:
+        before = old.records[key]
+        after = new.records[key]
+        if any(abs(float(before[name]) - float(after[name])) > tolerance for name in MULTIPLIER_FIELDS):
+            changed.add(key)
+
+    return {'added': new_keys - old_keys, 'removed': old_keys - new_keys, 'changed': changed}
+
+
+def apply_snapshot(snapshot: DatasetSnapshot, processor: Any = None):
+    """Load a snapshot's multipliers into a DataProcessor (the shared one by default)"""
+    if processor is None:
+        from data_processor import data_processor as processor
+    for geography in snapshot.geographies:
+        processor.apply_multipliers(geography, snapshot.multipliers_for(geography), snapshot.vintage)
+
+
+def context_dependency_keys(llm_context: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+    """The (geography, NAICS, vintage) keys an analysis read, taken from its prepare_llm_context output"""
+    multipliers = llm_context.get('economic_multipliers', {})
+    return [(
+        llm_context.get('geography', 'homestead'),
+        str(multipliers.get('naics_code', '')),
+        multipliers.get('vintage', ''),
+    )]
+
+
+class DependencyIndex:
+    """
+    Inverted index from (geography, NAICS) to the analyses that read it
+
+    Backed by SQLite so a history of tens of thousands of analyses can be
+    queried without scanning: finding the analyses affected by a vintage
+    diff costs one indexed lookup per changed key. sync_from_history keeps
+    it in step with AnalysisHistory, which records the NAICS code and
+    vintage of every analysis.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DEPENDENCY_PATH):
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        if db_path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS analysis_dependencies (
+                analysis_id TEXT NOT NULL,
+                geography TEXT NOT NULL,
+                naics_code TEXT NOT NULL,
+                vintage TEXT NOT NULL,
+                PRIMARY KEY (analysis_id, geography, naics_code)
+            );
+            CREATE INDEX IF NOT EXISTS idx_dependencies_key
+                ON analysis_dependencies(geography, naics_code, vintage);
+            CREATE TABLE IF NOT EXISTS history_sync (
+                history_path TEXT PRIMARY KEY,
+                last_row_id INTEGER NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def record(self, analysis_id: str, keys: Iterable[Tuple[str, str, str]]):
+        """Record (or replace) the dataset keys an analysis depends on"""
+        with self._lock:
+            self._conn.execute("DELETE FROM analysis_dependencies WHERE analysis_id = ?", (analysis_id,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO analysis_dependencies VALUES (?, ?, ?, ?)",
+                [(analysis_id, geography, naics, vintage) for geography, naics, vintage in keys]
+            )
+            self._conn.commit()
+
+    def record_context(self, analysis_id: str, llm_context: Dict[str, Any]):
+        self.record(analysis_id, context_dependency_keys(llm_context))
+
+    def sync_from_history(self, history: Any) -> int:
+        """
+        Index every analysis appended to `history` since the last sync
+
+        Records superseded by a re-run are dropped from the index, so only
+        the latest record of each analysis is ever found stale. Returns the
+        number of analyses added.
+        """
+        history.flush()
+        with self._lock:
+            row = self._conn.execute("SELECT last_row_id FROM history_sync WHERE history_path = ?",
+                                     (history.db_path,)).fetchone()
+        synced_row_id = last_row_id = row[0] if row else 0
+
+        batch = []
+        superseded = []
+        for row_id, analysis_id, geography, naics_code, vintage, supersedes in history.iter_dependencies(last_row_id):
+            last_row_id = row_id
+            if naics_code:
+                batch.append((analysis_id, geography or 'homestead', str(naics_code), vintage or ''))
+            if supersedes:
+                superseded.append((supersedes,))
+        if last_row_id != synced_row_id:
+            with self._lock:
+                self._conn.executemany("INSERT OR REPLACE INTO analysis_dependencies VALUES (?, ?, ?, ?)", batch)
+                self._conn.executemany("DELETE FROM analysis_dependencies WHERE analysis_id = ?", superseded)
+                self._conn.execute("INSERT OR REPLACE INTO history_sync VALUES (?, ?)",
+                                   (history.db_path, last_row_id))
+                self._conn.commit()
+        return len(batch)
+
+    def dependents(self, keys: Iterable[DatasetKey], vintage: Optional[str] = None) -> Set[str]:
+        """Analyses that read any of `keys`, optionally only those built on `vintage`"""
+        found = set()
+        with self._lock:
+            for geography, naics in keys:
+                if vintage is None:
+                    rows = self._conn.execute(
+                        "SELECT analysis_id FROM analysis_dependencies WHERE geography = ? AND naics_code = ?",
+                        (geography, naics))
+                else:
+                    rows = self._conn.execute(
+                        "SELECT analysis_id FROM analysis_dependencies "
+                        "WHERE geography = ? AND naics_code = ? AND vintage = ?",
+                        (geography, naics, vintage))
+                found.update(row[0] for row in rows)
+        return found
+
+    def keys_for(self, analysis_id: str) -> List[DatasetKey]:
+        """The (geography, NAICS) keys recorded for an analysis"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT geography, naics_code FROM analysis_dependencies WHERE analysis_id = ?",
+                (analysis_id,)).fetchall()
+        return [(geography, naics) for geography, naics in rows]
+
+    def retag(self, keys: Iterable[DatasetKey], new_vintage: str, exclude: Iterable[str] = ()):
+        """Move dependencies on `keys` to a new vintage, except those of the `exclude` analyses"""
+        exclude = list(exclude)
+        sql = "UPDATE analysis_dependencies SET vintage = ? WHERE geography = ? AND naics_code = ?"
+        if exclude:
+            sql += f" AND analysis_id NOT IN ({', '.join('?' * len(exclude))})"
+        with self._lock:
+            self._conn.executemany(sql, [(new_vintage, geography, naics, *exclude) for geography, naics in keys])
+            self._conn.commit()
+
+    def count(self) -> int:
+        row = self._conn.execute("SELECT COUNT(DISTINCT analysis_id) FROM analysis_dependencies").fetchone()
+        return int(row[0])
+
+
+def _dependents_on(index: DependencyIndex, snapshot: DatasetSnapshot, keys: Iterable[DatasetKey]) -> Set[str]:
+    """Analyses that read any of `keys` as they are in `snapshot`, each on its own vintage"""
+    by_vintage = {}
+    for key in keys:
+        by_vintage.setdefault(snapshot.vintage_of(key), []).append(key)
+    found = set()
+    for vintage, vintage_keys in by_vintage.items():
+        found |= index.dependents(vintage_keys, vintage=vintage)
+    return found
+
+
+def stale_analyses(index: DependencyIndex, old: DatasetSnapshot, new: DatasetSnapshot,
+                   tolerance: float = 0.0) -> Set[str]:
+    """Analyses built on `old` that read a key which changed in `new`"""
+    return _dependents_on(index, old, diff_snapshots(old, new, tolerance)['changed'])
+
+
+def incremental_rerun(index: DependencyIndex, old: DatasetSnapshot, new: DatasetSnapshot,
+                      recompute: Callable[[str, DatasetSnapshot], Optional[Iterable[Tuple[str, str, str]]]],
+                      tolerance: float = 0.0) -> Dict[str, Any]:
+    """
+    Recompute only the analyses affected by a vintage change
+
+    Keys the new vintage removed are not recomputed: there are no new
+    numbers for them, so their analyses stay on the old vintage and are
+    reported as 'uncovered' for review.
+
+    Args:
+        index: Dependency index of stored analyses
+        old: Vintage the analyses were built on
+        new: Newly arrived vintage
+        recompute: Called as recompute(analysis_id, new) for each stale
+            analysis; returns the dependency keys the new run read (or None
+            to record the same keys under the new vintage).
+            history_recompute builds one backed by AnalysisHistory.
+
+    Returns:
+        {'recomputed': [...], 'failed': {analysis_id: error}, 'uncovered': [...], 'diff': {...}}
+    """
+    diff = diff_snapshots(old, new, tolerance)
+    stale = _dependents_on(index, old, diff['changed'])
+    uncovered = _dependents_on(index, old, diff['removed']) - stale
+
+    recomputed = []
+    failed = {}
+    for analysis_id in sorted(stale):
+        try:
+            keys = recompute(analysis_id, new)
+        except Exception as e:
+            failed[analysis_id] = str(e)
+            continue
+        if keys is None:
+            keys = [(geography, naics, new.vintage)
+                    for geography, naics in index.keys_for(analysis_id)]
+        index.record(analysis_id, keys)
+        recomputed.append(analysis_id)
+
+    # Every other dependency on a key the new snapshot covers is unaffected by
+    # the diff and is now valid under the new vintage; failed analyses stay on
+    # the old one so the next run retries them
+    index.retag(new.records, new.vintage, exclude=failed)
+
+    return {'recomputed': recomputed, 'failed': failed, 'uncovered': sorted(uncovered), 'diff': diff}
+
+
+def history_recompute(history: Any, processor: Any = None, client: Any = None
+                      ) -> Callable[[str, DatasetSnapshot], List[Tuple[str, str, str]]]:
+    """
+    Build a recompute callback for incremental_rerun backed by AnalysisHistory
+
+    Each stale analysis gets a fresh prepare_llm_context and calculator run
+    from its stored form inputs, using the multipliers currently loaded in
+    `processor` (apply the new snapshot first); multipliers stored with the
+    inputs are dropped so they never override the new vintage. When a Stack.ai client is
+    given the report is regenerated too; otherwise the stored report is kept.
+    The re-run is appended to the history as a record superseding the
+    original; sync the index afterwards so it tracks the new record.
+    """
+    from economic_calculator import MULTIPLIER_KEYS, calculate_economic_impact, form_to_calculator_inputs
+
+    if processor is None:
+        from data_processor import data_processor as processor
+
+    def recompute(analysis_id: str, snapshot: DatasetSnapshot) -> List[Tuple[str, str, str]]:
+        record = history.get(analysis_id)
+        if record is None:
+            raise KeyError(f"Analysis {analysis_id} is not in the history")
+        form_data = record['form_data']
+        geography = record['geography'] or 'homestead'
+
+        llm_context = processor.prepare_llm_context(form_data, geography)
+        inputs = {key: value for key, value in form_data.items() if key not in MULTIPLIER_KEYS}
+        results = calculate_economic_impact(form_to_calculator_inputs(inputs, geography, processor))
+
+        report_json = None
+        if client is not None:
+            response = client.run_analysis(form_data, geography)
+            if not response.get('success'):
+                raise RuntimeError(response.get('error') or 'Report generation failed')
+            report_json = response.get('report_json')
+
+        history.supersede(analysis_id, llm_context, results, report_json)
+        return context_dependency_keys(llm_context)
+
+    return recompute
+
+
+def rerun_stale_analyses(new: DatasetSnapshot, history: Any = None, index: Optional[DependencyIndex] = None,
+                         processor: Any = None, client: Any = None, tolerance: float = 0.0) -> Dict[str, Any]:
+    """
+    Load a new multiplier vintage and re-run exactly the stored analyses it affects
+
+    Example - a new Homestead export arrives:
+        new = DatasetSnapshot.from_csv('data/Homestead/Regional Multipliers.csv',
+                                       'homestead', 'Lightcast 2026')
+        rerun_stale_analyses(new)
+
+    The current tables of the new snapshot's geographies are snapshotted as
+    the old vintage, the dependency index is brought up to date with the
+    history, the new multipliers are loaded into `processor`, and each stale
+    analysis is recomputed and appended to the history as a new record
+    superseding the original. Industries missing
+    from the new export keep their old multipliers and vintage.
+    """
+    if history is None:
+        from analysis_history import get_analysis_history
+        history = get_analysis_history()
+    if processor is None:
+        from data_processor import data_processor as processor
+    index = index or get_dependency_index()
+
+    old = DatasetSnapshot.from_data_processor(processor, geographies=new.geographies)
+    index.sync_from_history(history)
+    apply_snapshot(new, processor)
+    result = incremental_rerun(index, old, new, history_recompute(history, processor, client), tolerance)
+    index.sync_from_history(history)
+    return result
+
+
+# Create index lazily so importing this module never touches the filesystem
+_dependency_index = None
+
+
+def get_dependency_index() -> DependencyIndex:
+    """Returns the shared DependencyIndex for this process"""
+    global _dependency_index
+    if _dependency_index is None:
+        _dependency_index = DependencyIndex()
+    return _dependency_index
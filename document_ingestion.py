@@ -0,0 +1,290 @@
+import csv
+import io
+import os
+import re
+from typing import Dict, Any, List, Optional, Iterator, Iterable, Tuple
+
+
+# Default label dictionary: form_data key -> phrases that identify the row in a
+# developer pro-forma. Phrases are matched on whole words after normalization,
+# longest phrase first, so "total development cost" wins over "development cost".
+DEFAULT_FIELD_LABELS = {
+    'total_development_costs': ['total development cost', 'total development costs',
+                                'total project cost', 'total project costs', 'tdc'],
+    'hard_costs': ['hard cost', 'hard costs', 'construction cost', 'construction costs',
+                   'total hard costs'],
+    'soft_costs': ['soft cost', 'soft costs', 'total soft costs'],
+    'financing_costs': ['financing cost', 'financing costs', 'finance costs',
+                        'construction interest', 'loan fees'],
+    'ffe_costs': ['ff&e', 'ffe', 'furniture fixtures and equipment'],
+    'purchase_price': ['purchase price', 'acquisition cost', 'land acquisition'],
+    'construction_duration': ['construction duration', 'construction period',
+                              'construction months'],
+    'full_time_jobs': ['full time jobs', 'full time employees', 'full time positions',
+                       'permanent fte', 'permanent ftes', 'operating fte', 'operating ftes'],
+    'part_time_jobs': ['part time jobs', 'part time employees', 'part time positions'],
+    'average_wage': ['average wage', 'avg wage', 'average hourly wage', 'average salary'],
+    'annual_revenue': ['annual revenue', 'gross revenue', 'total revenue', 'gross sales',
+                       'annual sales'],
+    'annual_expenses': ['annual expenses', 'operating expenses', 'total operating expenses',
+                        'opex'],
+    'annual_rent': ['annual rent', 'base rent'],
+    'rent_per_sf': ['rent per sf', 'rent psf', 'rent per square foot'],
+}
+
+# Labels containing these words never fill a field: "Soft cost contingency"
+# is a line inside the soft costs, not their total
+EXCLUDED_LABEL_WORDS = {'contingency', 'contingencies', 'allowance'}
+
+SPREADSHEET_EXTENSIONS = ('.xlsx', '.xlsm', '.csv')
+
+# A label qualified after a dash or colon ("Construction cost - shell") is a
+# sub-line of a budget section
+_SUB_LINE_PATTERN = re.compile(r'(?:\s[-\u2013\u2014]|:)\s*\S')
+
+# Match ranks: a total row beats a plain label, whatever comes first
+_LINE_ITEM = 1
+_TOTAL = 2
+
+# A number, either accounting-negative "(1,250)" or optionally signed "-1,250",
+# then an optional scale ("850K", "1.2M", "2.5 MM", "3 million") and at most a unit
+# such as "months", "sf" or "/hr"
+_NUMBER_PATTERN = re.compile(
+    r'^(?:\(([\d,]*\.?\d+)\)|(-?[\d,]*\.?\d+))\s*(?:(thousand|million|billion|mm|bn|k|m|b)\b)?(?:\s*/?\s*[a-z][a-z .]*)?$',
+    re.IGNORECASE
+)
+
+SCALE_SUFFIXES = {'k': 1e3, 'thousand': 1e3, 'm': 1e6, 'mm': 1e6, 'million': 1e6,
+                  'b': 1e9, 'bn': 1e9, 'billion': 1e9}
+
+
+def normalize_label(text: str) -> str:
+    """Lowercase a label and collapse punctuation to single spaces"""
+    text = str(text).lower().replace('-', ' ').replace('_', ' ')
+    text = re.sub(r'[^a-z0-9&% ]+', ' ', text)
+    return ' '.join(text.split())
+
+
+def parse_number(value: Any) -> Optional[float]:
+    """
+    Parse a spreadsheet cell into a float
+
+    Handles native numbers and text such as "$1,250,000", "12 months",
+    "(45,000)" (accounting negative), "18%", "$18.50/hr" and scaled amounts
+    like "$850K", "$1.2M" or "2.5 MM". Returns None for anything that is not
+    entirely numeric, e.g. "1 250 000" or "(-5)".
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    text = str(value).replace('$', '').replace('%', '').strip()
+    match = _NUMBER_PATTERN.match(text)
+    if not match:
+        return None
+
+    accounting, signed, scale = match.groups()
+    number = -float(accounting.replace(',', '')) if accounting is not None else float(signed.replace(',', ''))
+    return number * SCALE_SUFFIXES[scale.lower()] if scale else number
+
+
+class ProformaIngestor:
+    """
+    Streams uploaded project spreadsheets and pulls pro-forma fields into form_data
+
+    XLSX workbooks are opened in openpyxl read-only mode and iterated row by
+    row, so multi-sheet developer pro-formas are never fully loaded into
+    memory. CSV files are read with the csv module one line at a time.
+    """
+
+    def __init__(self, field_labels: Optional[Dict[str, List[str]]] = None):
+        self.field_labels = field_labels or DEFAULT_FIELD_LABELS
+
+        # (padded phrase, field) pairs, longest phrase first
+        phrases = []
+        for field, labels in self.field_labels.items():
+            for label in labels:
+                phrases.append((f" {normalize_label(label)} ", field))
+        self._phrases = sorted(phrases, key=lambda item: len(item[0]), reverse=True)
+
+    def match_field(self, label: Any) -> Optional[str]:
+        """Return the form_data key a row label refers to, if any"""
+        match = self._match(label)
+        return match[0] if match else None
+
+    def _match(self, label: Any) -> Optional[Tuple[str, int]]:
+        """(field, rank) for a row label; contingency and sub-line labels match nothing"""
+        if not isinstance(label, str):
+            return None
+        normalized = normalize_label(label)
+        words = normalized.split()
+        if not words or EXCLUDED_LABEL_WORDS.intersection(words):
+            return None
+        if words[0] == 'total' or words[-1] == 'total':
+            rank = _TOTAL
+        elif _SUB_LINE_PATTERN.search(label.strip()):
+            return None
+        else:
+            rank = _LINE_ITEM
+
+        padded = f" {normalized} "
+        for phrase, field in self._phrases:
+            if phrase in padded:
+                return field, rank
+        return None
+
+    def iter_rows(self, source: Any, filename: Optional[str] = None) -> Iterator[Tuple[Any, ...]]:
+        """
+        Yield rows from an XLSX or CSV source without materializing the file
+
+        Args:
+            source: Path or binary file-like object (e.g. a Streamlit UploadedFile)
+            filename: Name used to detect the format when source is file-like
+        """
+        name = (filename or getattr(source, 'name', None) or str(source)).lower()
+
+        if name.endswith('.csv'):
+            if isinstance(source, (str, os.PathLike)):
+                with open(source, newline='', encoding='utf-8-sig') as handle:
+                    yield from csv.reader(handle)
+            else:
+                handle = io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+                try:
+                    yield from csv.reader(handle)
+                finally:
+                    handle.detach()
+            return
+
+        if name.endswith(('.xlsx', '.xlsm')):
+            from openpyxl import load_workbook
+
+            workbook = load_workbook(source, read_only=True, data_only=True)
+            try:
+                for sheet in workbook.worksheets:
+                    yield from sheet.iter_rows(values_only=True)
+            finally:
+                workbook.close()
+            return
+
+        raise ValueError(f"Unsupported spreadsheet format: {name}")
+
+    def extract_from_rows(self, rows: Iterable[Iterable[Any]]) -> Dict[str, float]:
+        """
+        Detect pro-forma fields in a stream of rows
+
+        A row matches when one of its text cells contains a known label; the
+        first numeric cell to the right of that label is taken as the value.
+        A row labelled as a total ("Total Hard Costs") wins over any other
+        row for the same field; otherwise the first occurrence wins.
+        Contingency lines and qualified sub-lines ("Construction cost -
+        shell") are ignored. Iteration stops early once every configured
+        field has been found on a total row.
+        """
+        extracted = {}
+        ranks = {}
+        wanted = len(self.field_labels)
+
+        for row in rows:
+            cells = list(row)
+            for index, cell in enumerate(cells):
+                match = self._match(cell)
+                if match is None:
+                    continue
+                field, rank = match
+                if rank > ranks.get(field, 0):
+                    for candidate in cells[index + 1:]:
+                        number = parse_number(candidate)
+                        if number is not None:
+                            extracted[field] = number
+                            ranks[field] = rank
+                            break
+                break
+
+            if len(ranks) == wanted and all(rank == _TOTAL for rank in ranks.values()):
+                break
+
+        return extracted
+
+    def extract(self, source: Any, filename: Optional[str] = None) -> Dict[str, float]:
+        """Extract pro-forma fields from a single spreadsheet"""
+        return self.extract_from_rows(self.iter_rows(source, filename))
+
+    def ingest_uploads(self, uploaded_files: Iterable[Any]) -> Dict[str, float]:
+        """
+        Extract fields from the form's uploaded project documents
+
+        Non-spreadsheet uploads (PDF, DOCX, images) are skipped. When several
+        spreadsheets are uploaded, earlier files take precedence.
+        """
+        extracted = {}
+        for uploaded in uploaded_files or []:
+            name = getattr(uploaded, 'name', '')
+            if not name.lower().endswith(SPREADSHEET_EXTENSIONS):
+                continue
+            try:
+                fields = self.extract(uploaded, name)
+            except Exception as e:
+                print(f"Warning: Could not read pro-forma from '{name}': {e}")
+                continue
+            finally:
+                if hasattr(uploaded, 'seek'):
+                    uploaded.seek(0)
+            for field, value in fields.items():
+                extracted.setdefault(field, value)
+        return extracted
+
+    def ingest_folder(self, folder: str) -> Iterator[Dict[str, Any]]:
+        """
+        Bulk mode: extract fields from every spreadsheet in a folder
+
+        Each submission may be a single spreadsheet or a sub-folder of
+        spreadsheets. Yields one record per submission so large batches can
+        be processed incrementally.
+
+        Yields:
+            {'submission': name, 'fields': {...}, 'errors': [...]}
+        """
+        for entry in sorted(os.listdir(folder)):
+            path = os.path.join(folder, entry)
+            if os.path.isdir(path):
+                files = [os.path.join(path, name) for name in sorted(os.listdir(path))]
+            elif entry.lower().endswith(SPREADSHEET_EXTENSIONS):
+                files = [path]
+            else:
+                continue
+
+            fields = {}
+            errors = []
+            for file_path in files:
+                if not file_path.lower().endswith(SPREADSHEET_EXTENSIONS):
+                    continue
+                try:
+                    for field, value in self.extract(file_path).items():
+                        fields.setdefault(field, value)
+                except Exception as e:
+                    errors.append(f"{os.path.basename(file_path)}: {e}")
+
+            yield {'submission': entry, 'fields': fields, 'errors': errors}
+
+
+def merge_into_form_data(form_data: Dict[str, Any], extracted: Dict[str, float],
+                         overwrite: bool = False) -> Dict[str, Any]:
+    """
+    Populate form_data with extracted pro-forma values
+
+    By default only fields the user left empty or at zero are filled, so
+    anything typed into the form takes precedence over the documents.
+    Job counts and durations are stored as integers to match the form inputs.
+    """
+    integer_fields = {'full_time_jobs', 'part_time_jobs', 'construction_duration'}
+    merged = dict(form_data)
+    for field, value in extracted.items():
+        if not overwrite and merged.get(field):
+            continue
+        merged[field] = int(round(value)) if field in integer_fields else value
+    return merged
+
+
+# Create singleton instance
+proforma_ingestor = ProformaIngestor()
@@ -77,3 +77,88 @@ def calculate_economic_impact(form_data):
     }
     
     return results
+
+
+# Calculator inputs, in the keys calculate_economic_impact reads
+CALCULATOR_KEYS = [
+    'total_investment', 'cra_incentive', 'private_funding', 'construction_jobs',
+    'construction_avg_wage', 'permanent_jobs', 'permanent_avg_wage', 'construction_duration',
+    'analysis_period', 'annual_operating_costs', 'annual_revenue', 'property_value_increase',
+    'property_tax_rate', 'local_procurement_pct', 'employment_multiplier', 'income_multiplier',
+    'output_multiplier', 'sales_tax_rate'
+]
+
+# Calculator inputs taken from DataProcessor's multiplier tables
+MULTIPLIER_KEYS = ['employment_multiplier', 'income_multiplier', 'output_multiplier']
+
+COMMUNITY_BENEFIT_KEYS = ['affordable_housing_units', 'public_space_sqft', 'parking_spaces', 'retail_units']
+
+# Assumptions used when a form submission is mapped to calculator inputs
+DEFAULT_ANALYSIS_PERIOD = 10
+DEFAULT_CONSTRUCTION_DURATION = 12
+DEFAULT_JOB_YEARS_PER_MILLION = 6.5  # direct construction job-years per $1M of hard costs
+DEFAULT_CONSTRUCTION_WAGE = 25.0
+DEFAULT_LOCAL_PROCUREMENT_PCT = 50.0
+PART_TIME_FTE = 0.5
+SALES_TAX_RATES = {'homestead': 7.0, 'florida_statewide': 6.0}
+
+
+def _amount(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def form_to_calculator_inputs(form_data, geography="homestead", processor=None):
+    """
+    Map a form submission onto the inputs calculate_economic_impact reads
+
+    Calculator keys already present in form_data are kept as-is, so
+    calculator-shaped records pass through unchanged. Missing keys are
+    derived from the form fields (total development costs, jobs, wages,
+    revenue) and from DataProcessor's multipliers and fiscal parameters for
+    the geography (the shared data_processor unless `processor` is given).
+    """
+    if processor is None:
+        from data_processor import data_processor as processor
+
+    geography = form_data.get('geography', geography)
+    multipliers = processor.get_relevant_multipliers(form_data.get('proposed_use') or 'restaurant', geography)
+    fiscal = processor.get_fiscal_parameters(geography)
+
+    hard_costs = _amount(form_data.get('hard_costs'))
+    component_costs = sum(_amount(form_data.get(key)) for key in
+                          ('hard_costs', 'soft_costs', 'financing_costs', 'ffe_costs'))
+    total_investment = (_amount(form_data.get('total_investment'))
+                        or _amount(form_data.get('total_development_costs')) or component_costs)
+    cra_incentive = _amount(form_data.get('cra_incentive')) or _amount(form_data.get('funding_request'))
+    duration = _amount(form_data.get('construction_duration')) or DEFAULT_CONSTRUCTION_DURATION
+
+    derived = {
+        'total_investment': total_investment,
+        'cra_incentive': cra_incentive,
+        'private_funding': max(total_investment - cra_incentive, 0.0),
+        # Average construction FTEs over the build, from job-years per $1M of hard costs
+        'construction_jobs': (hard_costs or total_investment) / 1_000_000 * DEFAULT_JOB_YEARS_PER_MILLION * 12 / duration,
+        'construction_avg_wage': DEFAULT_CONSTRUCTION_WAGE,
+        'permanent_jobs': _amount(form_data.get('full_time_jobs')) + PART_TIME_FTE * _amount(form_data.get('part_time_jobs')),
+        'permanent_avg_wage': _amount(form_data.get('average_wage')),
+        'construction_duration': duration,
+        'analysis_period': DEFAULT_ANALYSIS_PERIOD,
+        'annual_operating_costs': _amount(form_data.get('annual_expenses')),
+        'annual_revenue': _amount(form_data.get('annual_revenue')),
+        'property_value_increase': (hard_costs or total_investment) * fiscal['hard_cost_capitalization_rate'],
+        # Millage is per $1,000; the calculator takes a percentage
+        'property_tax_rate': fiscal['combined_millage'] / 10,
+        'local_procurement_pct': DEFAULT_LOCAL_PROCUREMENT_PCT,
+        'employment_multiplier': multipliers['employment_multiplier'],
+        'income_multiplier': multipliers['earnings_multiplier'],
+        'output_multiplier': multipliers['output_multiplier'],
+        'sales_tax_rate': SALES_TAX_RATES.get(geography, SALES_TAX_RATES['homestead']),
+    }
+
+    inputs = {key: form_data[key] if form_data.get(key) is not None else derived[key] for key in CALCULATOR_KEYS}
+    for key in COMMUNITY_BENEFIT_KEYS:
+        inputs[key] = form_data.get(key) or 0
+    return inputs
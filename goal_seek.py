@@ -0,0 +1,267 @@
+from typing import Dict, Any, List, Optional, Union
+
+import numpy as np
+
+from economic_calculator import CALCULATOR_KEYS
+
+
+# Whether the policy question is usually "how much at most" or "how many at least"
+DEFAULT_OBJECTIVES = {
+    'cra_incentive': 'max',
+    'permanent_jobs': 'min',
+    'construction_jobs': 'min',
+    'permanent_avg_wage': 'min',
+    'property_value_increase': 'min',
+    'annual_revenue': 'min',
+    'total_investment': 'min',
+}
+
+HOURS_PER_YEAR = 2080
+
+# Without an explicit upper bound the search starts at max(DEFAULT_UPPER,
+# 10x the current value) and grows geometrically until it brackets the target,
+# so dollar inputs in the millions solve as well as job counts in the tens
+DEFAULT_UPPER = 10_000.0
+EXPANSION_FACTOR = 10.0
+MAX_EXPANSIONS = 12
+
+# Inputs reported in whole units, rounded towards the feasible side
+INTEGER_VARIABLES = {'permanent_jobs', 'construction_jobs'}
+
+
+def to_arrays(projects: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Stack a portfolio of calculator inputs into one float array per input"""
+    return {key: np.array([float(project.get(key) or 0) for project in projects]) for key in CALCULATOR_KEYS}
+
+
+def evaluate_metrics(inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Vectorized form of the numeric outputs of calculate_economic_impact
+
+    Uses the same formulas as economic_calculator.calculate_economic_impact,
+    without rounding, over whole arrays of projects at once.
+    """
+    employment_multiplier = inputs['employment_multiplier']
+    income_multiplier = inputs['income_multiplier']
+    cra_incentive = inputs['cra_incentive']
+
+    annual_property_tax = inputs['property_value_increase'] * (inputs['property_tax_rate'] / 100)
+    local_spending = (inputs['annual_operating_costs'] + inputs['annual_revenue']) * (inputs['local_procurement_pct'] / 100)
+    annual_sales_tax = local_spending * (inputs['sales_tax_rate'] / 100)
+    annual_tax_revenue = annual_property_tax + annual_sales_tax
+    total_tax_revenue_period = annual_tax_revenue * inputs['analysis_period']
+
+    has_incentive = cra_incentive > 0
+    safe_incentive = np.where(has_incentive, cra_incentive, 1.0)
+    safe_annual_tax = np.where(annual_tax_revenue > 0, annual_tax_revenue, 1.0)
+
+    construction_hours = inputs['construction_jobs'] * HOURS_PER_YEAR * (inputs['construction_duration'] / 12)
+    permanent_income_annual = inputs['permanent_jobs'] * HOURS_PER_YEAR * inputs['permanent_avg_wage'] * income_multiplier
+
+    return {
+        'total_jobs_construction': inputs['construction_jobs'] * employment_multiplier,
+        'total_jobs_permanent': inputs['permanent_jobs'] * employment_multiplier,
+        'total_construction_income': construction_hours * inputs['construction_avg_wage'] * income_multiplier,
+        'total_permanent_income_annual': permanent_income_annual,
+        'total_permanent_income_period': permanent_income_annual * inputs['analysis_period'],
+        'total_output': inputs['total_investment'] * inputs['output_multiplier'],
+        'annual_property_tax': annual_property_tax,
+        'annual_sales_tax': annual_sales_tax,
+        'annual_tax_revenue': annual_tax_revenue,
+        'total_tax_revenue_period': total_tax_revenue_period,
+        'roi_ratio': np.where(has_incentive, total_tax_revenue_period / safe_incentive, 0.0),
+        'payback_years': np.where(has_incentive & (annual_tax_revenue > 0), cra_incentive / safe_annual_tax, 0.0),
+        'leverage_ratio': np.where(has_incentive, inputs['private_funding'] / safe_incentive, 0.0),
+    }
+
+
+def _meets(values: np.ndarray, target: float, bound: str) -> np.ndarray:
+    return values >= target if bound == '>=' else values <= target
+
+
+def _closed_form(inputs: Dict[str, np.ndarray], metric: str, variable: str,
+                 target: float) -> Optional[np.ndarray]:
+    """
+    Exact inversion for metrics that are linear or reciprocal in the variable
+
+    Returns the variable value at which metric == target, or None when no
+    closed form is known for this (metric, variable) pair.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if variable == 'cra_incentive':
+            metrics = evaluate_metrics(inputs)
+            if metric == 'roi_ratio':
+                return metrics['total_tax_revenue_period'] / target
+            if metric == 'payback_years':
+                return metrics['annual_tax_revenue'] * target
+            if metric == 'leverage_ratio':
+                return inputs['private_funding'] / target
+
+        if variable == 'permanent_jobs':
+            if metric == 'total_jobs_permanent':
+                return target / inputs['employment_multiplier']
+            if metric == 'total_permanent_income_annual':
+                return target / (HOURS_PER_YEAR * inputs['permanent_avg_wage'] * inputs['income_multiplier'])
+
+        if variable == 'construction_jobs' and metric == 'total_jobs_construction':
+            return target / inputs['employment_multiplier']
+
+        if variable == 'total_investment' and metric == 'total_output':
+            return target / inputs['output_multiplier']
+
+    return None
+
+
+def _bisect(inputs: Dict[str, np.ndarray], metric: str, variable: str, target: float, bound: str,
+            objective: str, lower: np.ndarray, upper: np.ndarray,
+            tolerance: float, max_iterations: int, expand: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Vectorized bracketing search for the edge of the feasible region
+
+    Assumes the metric is monotone in the variable over [lower, upper], so
+    the feasible set is an interval touching one end of the bracket. All
+    projects are bisected together, one array evaluation per iteration.
+    With `expand`, upper is first grown by EXPANSION_FACTOR wherever the
+    bracket does not yet contain the edge.
+    """
+    def feasible(x):
+        return _meets(evaluate_metrics({**inputs, variable: x})[metric], target, bound)
+
+    ok_lower = feasible(lower)
+    ok_upper = feasible(upper)
+
+    if expand:
+        for _ in range(MAX_EXPANSIONS):
+            # A feasible lower end already answers a minimization
+            grow = (ok_lower == ok_upper) & ~(ok_lower & (objective == 'min'))
+            if not np.any(grow):
+                break
+            upper = np.where(grow, np.maximum(upper, tolerance) * EXPANSION_FACTOR, upper)
+            ok_upper = np.where(grow, feasible(upper), ok_upper)
+
+    # Bisect between a feasible end (good) and an infeasible end (bad)
+    good = np.where(ok_lower, lower, upper)
+    bad = np.where(ok_lower, upper, lower)
+    crossing = ok_lower != ok_upper
+
+    for _ in range(max_iterations):
+        if not np.any(crossing & (np.abs(bad - good) > tolerance)):
+            break
+        middle = (good + bad) / 2
+        ok_middle = feasible(middle)
+        good = np.where(crossing & ok_middle, middle, good)
+        bad = np.where(crossing & ~ok_middle, middle, bad)
+
+    value = np.where(crossing, good, np.nan)
+    both = ok_lower & ok_upper
+    value = np.where(both, upper if objective == 'max' else lower, value)
+
+    status = np.full(value.shape, 'solved', dtype=object)
+    status[both] = 'unconstrained'
+    status[~ok_lower & ~ok_upper] = 'infeasible'
+    return {'value': value, 'status': status}
+
+
+def goal_seek(projects: Union[Dict[str, Any], List[Dict[str, Any]]], metric: str, target: float,
+              variable: str, bound: str = '>=', objective: Optional[str] = None,
+              lower: Union[float, List[float]] = 0.0, upper: Optional[Union[float, List[float]]] = None,
+              tolerance: float = 1e-6, max_iterations: int = 200) -> List[Dict[str, Any]]:
+    """
+    Solve for the input that brings a calculator metric to a policy threshold
+
+    Examples:
+        # Maximum CRA incentive that keeps ROI >= 2.0
+        goal_seek(portfolio, 'roi_ratio', 2.0, 'cra_incentive', '>=')
+        # Minimum permanent jobs for 50 total jobs
+        goal_seek(portfolio, 'total_jobs_permanent', 50, 'permanent_jobs', '>=')
+
+    Args:
+        projects: One calculator form_data dict or a whole portfolio
+        metric: Output of calculate_economic_impact to constrain
+        target: Threshold value
+        variable: Input to solve for
+        bound: '>=' or '<=' - how the metric must compare with the target
+        objective: 'max' or 'min' of the variable; defaults per variable
+            (maximum incentive, minimum jobs)
+        lower, upper: Search bracket, scalar or per project. upper defaults
+            to total_investment for cra_incentive; for other inputs the
+            bracket grows geometrically from max(10,000, 10x the current
+            value) until it contains the answer.
+
+    Returns:
+        One dict per project with 'value' (None when infeasible), the
+        'achieved' metric at that value and 'method': 'closed_form',
+        'bisection', 'unconstrained' or 'infeasible'. Job counts are
+        rounded to whole jobs towards the feasible side; the unrounded
+        solution is kept in 'exact_value'.
+    """
+    if bound not in ('>=', '<='):
+        raise ValueError("bound must be '>=' or '<='")
+    if variable not in CALCULATOR_KEYS:
+        raise ValueError(f"Unknown input '{variable}'")
+
+    portfolio = [projects] if isinstance(projects, dict) else list(projects)
+    inputs = to_arrays(portfolio)
+    if metric not in evaluate_metrics(inputs):
+        raise ValueError(f"Unknown metric '{metric}'")
+
+    objective = objective or DEFAULT_OBJECTIVES.get(variable, 'min')
+    count = len(portfolio)
+    lower_arr = np.broadcast_to(np.asarray(lower, dtype=float), (count,)).copy()
+    expand = upper is None and variable != 'cra_incentive'
+    if upper is None:
+        upper = (inputs['total_investment'] if variable == 'cra_incentive'
+                 else np.maximum(DEFAULT_UPPER, inputs[variable] * EXPANSION_FACTOR))
+    upper_arr = np.broadcast_to(np.asarray(upper, dtype=float), (count,)).copy()
+    # An open-ended search accepts exact solutions beyond the starting bracket
+    closed_form_upper = np.full(count, np.inf) if expand else upper_arr
+
+    value = np.full(count, np.nan)
+    method = np.full(count, '', dtype=object)
+
+    candidate = _closed_form(inputs, metric, variable, target)
+    if candidate is not None:
+        in_range = np.isfinite(candidate) & (candidate >= lower_arr) & (candidate <= closed_form_upper)
+        # The inversion gives the boundary; keep it only where it satisfies the
+        # bound and the feasible side lies in the objective's direction
+        safe = np.where(in_range, candidate, lower_arr)
+        step = np.maximum(np.abs(safe) * 1e-6, tolerance)
+        beyond = safe + step if objective == 'max' else safe - step
+        with np.errstate(invalid='ignore'):
+            achieved = evaluate_metrics({**inputs, variable: safe})[metric]
+            overshoot = evaluate_metrics({**inputs, variable: beyond})[metric]
+        valid = (in_range & np.isclose(achieved, target, rtol=1e-9, atol=1e-9)
+                 & ~_meets(overshoot, target, bound))
+        value[valid] = candidate[valid]
+        method[valid] = 'closed_form'
+
+    remaining = method == ''
+    if np.any(remaining):
+        subset = {key: array[remaining] for key, array in inputs.items()}
+        solved = _bisect(subset, metric, variable, target, bound, objective,
+                         lower_arr[remaining], upper_arr[remaining], tolerance, max_iterations, expand)
+        value[remaining] = solved['value']
+        method[remaining] = np.where(solved['status'] == 'solved', 'bisection', solved['status'])
+
+    exact = value.copy()
+    if variable in INTEGER_VARIABLES:
+        # Round a tiny tolerance first so 12.0000001 does not become 13
+        nudged = np.round(value, 6)
+        value = np.ceil(nudged) if objective == 'min' else np.floor(nudged)
+
+    achieved = evaluate_metrics({**inputs, variable: np.where(np.isnan(value), 0.0, value)})[metric]
+
+    results = []
+    for i in range(count):
+        solved_value = None if np.isnan(value[i]) else float(value[i])
+        results.append({
+            'variable': variable,
+            'value': solved_value,
+            'exact_value': None if np.isnan(exact[i]) else float(exact[i]),
+            'metric': metric,
+            'achieved': float(achieved[i]) if solved_value is not None else None,
+            'target': target,
+            'bound': bound,
+            'method': method[i],
+        })
+    return results
@@ -0,0 +1,363 @@
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional
+
+
+STAGES = ['context', 'flow_call', 'json_parse', 'pdf', 'total']
+
+
+class LatencyProfile:
+    """
+    Latency distribution for the mock flow, in seconds
+
+    Spec strings:
+        fixed:2.0               always 2.0s
+        uniform:1.0:3.0         uniform between 1s and 3s
+        lognormal:2.0:0.5       lognormal with median 2.0s and sigma 0.5
+    """
+
+    def __init__(self, spec: str = 'fixed:0.0', seed: Optional[int] = None):
+        parts = spec.split(':')
+        self.kind = parts[0]
+        self.params = [float(p) for p in parts[1:]]
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        if self.kind not in ('fixed', 'uniform', 'lognormal'):
+            raise ValueError(f"Unknown latency profile: {spec}")
+
+    def sample(self) -> float:
+        with self._lock:
+            if self.kind == 'fixed':
+                return self.params[0]
+            if self.kind == 'uniform':
+                return self._random.uniform(self.params[0], self.params[1])
+            return self._random.lognormvariate(math.log(self.params[0]), self.params[1])
+
+
+def sample_report(payload_kb: int = 10, seed: int = 0) -> Dict[str, Any]:
+    """Report JSON in the schema generate_pdf_from_json consumes, padded to roughly payload_kb"""
+    rng = random.Random(seed)
+    base_value = rng.uniform(1_000_000, 5_000_000)
+    increment = base_value * 0.0105 * 0.95
+
+    filler = 'This project supports local employment and commercial activity. '
+    narrative = (filler * max(1, (payload_kb * 1024) // (len(filler) * 4)))
+
+    def impact_table(output, jobs, income):
+        rows = [
+            {'impact_type': 'Direct', 'output': output, 'jobs': jobs, 'labor_income': income},
+            {'impact_type': 'Indirect', 'output': output * 0.3, 'jobs': jobs * 0.25, 'labor_income': income * 0.3},
+            {'impact_type': 'Induced', 'output': output * 0.2, 'jobs': jobs * 0.15, 'labor_income': income * 0.2},
+        ]
+        rows.append({'impact_type': 'Total',
+                     'output': sum(r['output'] for r in rows),
+                     'jobs': sum(r['jobs'] for r in rows),
+                     'labor_income': sum(r['labor_income'] for r in rows)})
+        return rows
+
+    return {
+        'executive_summary': narrative,
+        'fiscal_highlights': {'year_1_cra_revenue': increment, 'ten_year_cumulative': increment * 11.5},
+        'cra_increment_projection': [
+            {'year': year, 'taxable_value': base_value * 1.03 ** (year - 1),
+             'cra_increment': increment * 1.03 ** (year - 1),
+             'cumulative': sum(increment * 1.03 ** (y - 1) for y in range(1, year + 1))}
+            for year in range(1, 11)
+        ],
+        'construction_impact': {'narrative': narrative, 'table': impact_table(base_value, 18, 900_000)},
+        'operations_impact': {'narrative': narrative, 'table': impact_table(base_value * 0.4, 12, 420_000)},
+        'ten_year_operations_projection': {'table': [
+            {'year': year, 'annual_output': base_value * 0.5 * 1.02 ** year, 'jobs': 15.0,
+             'labor_income': 500_000 * 1.02 ** year}
+            for year in range(1, 11)
+        ]},
+        'community_impacts': [{'category': 'Downtown Vitality', 'description': narrative}],
+    }
+
+
+class MockStackAIServer:
+    """
+    Local stand-in for https://api.stack-ai.com/inference/v0/run/{org_id}/{flow_id}
+
+    Responds with a report JSON in the 'outputs'/'out-0' envelope the real
+    flow uses, after a delay drawn from `latency`. A fraction `error_rate`
+    of requests fail with 429 or 500.
+    """
+
+    def __init__(self, latency: Optional[LatencyProfile] = None, error_rate: float = 0.0,
+                 payload_kb: int = 10, port: int = 0, seed: Optional[int] = None):
+        self.latency = latency or LatencyProfile()
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._body = json.dumps({'outputs': {'out-0': json.dumps(sample_report(payload_kb))}}).encode('utf-8')
+        self.requests_served = 0
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                self.rfile.read(length)
+                time.sleep(server.latency.sample())
+
+                with server._random_lock:
+                    server.requests_served += 1
+                    roll = server._random.random()
+                if roll < server.error_rate:
+                    status = 429 if roll < server.error_rate / 2 else 500
+                    body = json.dumps({'error': 'mock failure'}).encode('utf-8')
+                else:
+                    status = 200
+                    body = server._body
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockStackAIServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def sample_form_data(index: int) -> Dict[str, Any]:
+    """Form submission with the same keys the Streamlit form stores"""
+    uses = ['restaurant', 'cafe', 'retail', 'office', 'brewery', 'bar', 'distillery']
+    return {
+        'project_name': f"Load Test Project {index}",
+        'proposed_use': uses[index % len(uses)],
+        'total_development_costs': 1_500_000 + 10_000 * index,
+        'hard_costs': 1_000_000,
+        'soft_costs': 250_000,
+        'construction_duration': 9,
+        'full_time_jobs': 10 + index % 15,
+        'part_time_jobs': 5,
+        'average_wage': 18.5,
+        'annual_revenue': 1_200_000,
+        'funding_request': 150_000,
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, int(math.ceil(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def run_submission(client: Any, index: int, geography: str, render_pdf: bool) -> Dict[str, Any]:
+    """One end-to-end submission, timing each stage"""
+    from data_processor import data_processor
+
+    timings = {}
+    started = time.perf_counter()
+    form_data = sample_form_data(index)
+
+    try:
+        t = time.perf_counter()
+        llm_context = data_processor.prepare_llm_context(form_data, geography)
+        payload = client.build_payload(llm_context, form_data['project_name'])
+        timings['context'] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        result = client.call_flow(payload)
+        timings['flow_call'] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        _, report_json = client.parse_output(result)
+        timings['json_parse'] = time.perf_counter() - t
+
+        if render_pdf and report_json:
+            from pdf_generator import generate_pdf_from_json
+            t = time.perf_counter()
+            generate_pdf_from_json(report_json, form_data['project_name'])
+            timings['pdf'] = time.perf_counter() - t
+
+        error = None
+    except Exception as e:
+        error = str(e)
+
+    timings['total'] = time.perf_counter() - started
+    return {'timings': timings, 'error': error}
+
+
+def run_level(client: Any, concurrency: int, num_requests: int,
+              geography: str = 'homestead', render_pdf: bool = True) -> Dict[str, Any]:
+    """Run num_requests submissions at a fixed concurrency and summarize"""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda i: run_submission(client, i, geography, render_pdf),
+                                range(num_requests)))
+    elapsed = time.perf_counter() - started
+
+    succeeded = [r for r in results if r['error'] is None]
+    summary = {
+        'concurrency': concurrency,
+        'requests': num_requests,
+        'errors': num_requests - len(succeeded),
+        'elapsed_seconds': elapsed,
+        'throughput_per_minute': len(succeeded) / elapsed * 60 if elapsed > 0 else 0.0,
+        'stages': {},
+    }
+    for stage in STAGES:
+        samples = [r['timings'][stage] for r in succeeded if stage in r['timings']]
+        if samples:
+            summary['stages'][stage] = {
+                'p50': percentile(samples, 50),
+                'p95': percentile(samples, 95),
+                'p99': percentile(samples, 99),
+            }
+    return summary
+
+
+def find_saturation(levels: List[Dict[str, Any]], min_gain: float = 0.10,
+                    latency_factor: float = 2.0) -> Optional[int]:
+    """
+    First concurrency level where the deployment saturates
+
+    A level is saturated when throughput improves by less than `min_gain`
+    over the previous level, or p95 end-to-end latency exceeds
+    `latency_factor` times the single-level baseline.
+    """
+    if not levels:
+        return None
+    baseline_p95 = levels[0]['stages'].get('total', {}).get('p95', 0.0)
+    for previous, current in zip(levels, levels[1:]):
+        gain = (current['throughput_per_minute'] - previous['throughput_per_minute']) / max(previous['throughput_per_minute'], 1e-9)
+        p95 = current['stages'].get('total', {}).get('p95', 0.0)
+        if gain < min_gain or (baseline_p95 > 0 and p95 > latency_factor * baseline_p95):
+            return current['concurrency']
+    return None
+
+
+def run_load_test(concurrency_levels: List[int], num_requests: int, latency: str = 'fixed:0.5',
+                  error_rate: float = 0.0, payload_kb: int = 10, render_pdf: bool = True,
+                  geography: str = 'homestead', seed: Optional[int] = None) -> Dict[str, Any]:
+    """Start the mock flow, sweep the concurrency levels and return the report"""
+    with MockStackAIServer(LatencyProfile(latency, seed), error_rate, payload_kb, seed=seed) as server:
+        from stack_client import StackAIClient
+        client = StackAIClient(api_key='load-test', flow_id='load-test-org/load-test-flow',
+                               base_url=server.base_url)
+
+        levels = [run_level(client, c, num_requests, geography, render_pdf) for c in concurrency_levels]
+
+    return {'levels': levels, 'saturation_concurrency': find_saturation(levels)}
+
+
+def run_admission_test(num_requests: int, concurrency: int, latency: str = 'fixed:0.5',
+                       error_rate: float = 0.0, payload_kb: int = 10, rate_per_minute: float = 600,
+                       burst: int = 5, duplicates: int = 2, geography: str = 'homestead',
+                       seed: Optional[int] = None, **controller_options) -> Dict[str, Any]:
+    """
+    Drive request_admission.AdmissionController against the mock flow
+
+    Submissions are sent in groups of `duplicates` identical forms so
+    coalescing is exercised; a non-zero error_rate exercises the circuit
+    breaker. Returns outcome counts and the controller's stats().
+    """
+    from request_admission import AdmissionController
+    from stack_client import StackAIClient
+
+    with MockStackAIServer(LatencyProfile(latency, seed), error_rate, payload_kb, seed=seed) as server:
+        client = StackAIClient(api_key='load-test', flow_id='load-test-org/load-test-flow',
+                               base_url=server.base_url)
+        controller = AdmissionController(client, rate_per_minute=rate_per_minute, burst=burst,
+                                         **controller_options)
+
+        def submit(index):
+            return controller.run_analysis(sample_form_data(index // max(duplicates, 1)), geography)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(submit, range(num_requests)))
+        elapsed = time.perf_counter() - started
+
+    outcomes = {}
+    for result in results:
+        outcome = 'success' if result.get('success') else (result.get('error') or 'error')
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    return {'requests': num_requests, 'elapsed_seconds': elapsed, 'outcomes': outcomes,
+            'stats': controller.stats()}
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = []
+    for level in report['levels']:
+        lines.append(f"concurrency={level['concurrency']:>3}  requests={level['requests']}  "
+                     f"errors={level['errors']}  throughput={level['throughput_per_minute']:.1f}/min")
+        for stage, stats in level['stages'].items():
+            lines.append(f"    {stage:<10} p50={stats['p50'] * 1000:9.1f}ms  "
+                         f"p95={stats['p95'] * 1000:9.1f}ms  p99={stats['p99'] * 1000:9.1f}ms")
+    saturation = report['saturation_concurrency']
+    lines.append(f"Saturation point: concurrency={saturation}" if saturation
+                 else "Saturation point: not reached")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Drive concurrent end-to-end report submissions (context build -> flow call -> "
+                    "JSON parse -> PDF) against a local mock Stack.ai flow",
+        epilog="Example: python load_test.py --concurrency 1 2 4 8 16 --requests 40 "
+               "--latency lognormal:2.0:0.5 --error-rate 0.05 --payload-kb 20")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--requests', type=int, default=20, help="Submissions per concurrency level")
+    parser.add_argument('--latency', default='fixed:0.5', help="fixed:S, uniform:LO:HI or lognormal:MEDIAN:SIGMA")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--payload-kb', type=int, default=10)
+    parser.add_argument('--geography', default='homestead')
+    parser.add_argument('--no-pdf', action='store_true', help="Skip the PDF rendering stage")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--json', action='store_true', help="Print the raw report as JSON")
+    parser.add_argument('--admission', action='store_true',
+                        help="Send submissions through AdmissionController instead of sweeping concurrency")
+    parser.add_argument('--rate-per-minute', type=float, default=600, help="Admission quota (with --admission)")
+    parser.add_argument('--burst', type=int, default=5, help="Admission burst size (with --admission)")
+    args = parser.parse_args()
+
+    if args.admission:
+        report = run_admission_test(args.requests, max(args.concurrency), args.latency, args.error_rate,
+                                    args.payload_kb, args.rate_per_minute, args.burst,
+                                    geography=args.geography, seed=args.seed)
+        print(json.dumps(report, indent=2))
+        return
+
+    report = run_load_test(args.concurrency, args.requests, args.latency, args.error_rate,
+                           args.payload_kb, not args.no_pdf, args.geography, args.seed)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
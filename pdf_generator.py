@@ -1,6 +1,8 @@
 from weasyprint import HTML
 from weasyprint.text.fonts import FontConfiguration
 
+from chart_builder import build_report_charts
+
 
 def generate_pdf_from_json(report_data: dict, project_name: str) -> bytes:
     """
@@ -16,6 +18,7 @@ def generate_pdf_from_json(report_data: dict, project_name: str) -> bytes:
     
     # Build HTML sections from JSON
     html_sections = []
+    charts = build_report_charts(report_data)
     
     # Executive Summary
     html_sections.append("<h2>Executive Summary</h2>")
@@ -49,6 +52,8 @@ def generate_pdf_from_json(report_data: dict, project_name: str) -> bytes:
             html_sections.append(f"<td>${row.get('cumulative', 0):,.0f}</td>")
             html_sections.append("</tr>")
         html_sections.append("</table>")
+        if charts['cra_increment']:
+            html_sections.append(f"<div class='chart'>{charts['cra_increment']}</div>")
     
     # Construction Impact
     construction = report_data.get('construction_impact', {})
@@ -82,6 +87,10 @@ def generate_pdf_from_json(report_data: dict, project_name: str) -> bytes:
             html_sections.append(f"<td>${row.get('labor_income', row.get('earnings', 0)):,.0f}</td>")
             html_sections.append("</tr>")
         html_sections.append("</table>")
+    if charts['operations_output']:
+        html_sections.append(f"<div class='chart'>{charts['operations_output']}</div>")
+    if charts['job_composition']:
+        html_sections.append(f"<div class='chart'>{charts['job_composition']}</div>")
     
     # Ten-Year Operations Projection
     ten_year = report_data.get('ten_year_operations_projection', {})
@@ -108,7 +117,10 @@ def generate_pdf_from_json(report_data: dict, project_name: str) -> bytes:
     
     # Sources & Methodology
     html_sections.append("<h2>Sources & Methodology</h2>")
-    html_sections.append("""
+    if report_data.get('sources_html'):
+        html_sections.append(report_data['sources_html'])
+    else:
+        html_sections.append("""
     <p><strong>Data Sources:</strong></p>
     <ul>
         <li><strong>Economic Multipliers:</strong> Lightcast 2025 data for Homestead/South Dade region</li>
@@ -234,6 +246,16 @@ def generate_pdf_from_json(report_data: dict, project_name: str) -> bytes:
                 color: #1f4788;
             }}
             
+            .chart {{
+                margin: 10px 0 20px 0;
+                page-break-inside: avoid;
+            }}
+            
+            .chart svg {{
+                width: 100%;
+                height: auto;
+            }}
+            
             ul {{
                 margin: 10px 0;
                 padding-left: 20px;
@@ -0,0 +1,234 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+from artifact_store import normalize_for_hash
+
+
+# Each section is generated by its own flow call and cached on a hash of only
+# the context fields it reads. `depends_on` entries are dotted paths into the
+# prepare_llm_context output; `keys` are the report JSON keys the section
+# contributes to the schema generate_pdf_from_json consumes. Form inputs no
+# section lists are routed to CATCH_ALL_SECTION (see section_fields), so every
+# input reaches the flow and invalidates at least one cached section.
+SECTIONS = {
+    'executive_summary': {
+        'depends_on': [
+            'geography', 'project_inputs.project_name', 'project_inputs.proposed_use',
+            'project_inputs.current_taxable_value', 'project_inputs.parcel_size',
+            'project_inputs.building_size', 'project_inputs.current_sf',
+            'project_inputs.total_development_costs',
+            'project_inputs.hard_costs', 'project_inputs.soft_costs', 'project_inputs.full_time_jobs',
+            'project_inputs.part_time_jobs', 'project_inputs.annual_revenue',
+            'project_inputs.funding_request', 'economic_multipliers', 'fiscal_parameters',
+        ],
+        'keys': ['executive_summary', 'fiscal_highlights', 'cra_increment_projection'],
+    },
+    'construction_narrative': {
+        'depends_on': [
+            'geography', 'project_inputs.proposed_use', 'project_inputs.total_development_costs',
+            'project_inputs.hard_costs', 'project_inputs.soft_costs', 'project_inputs.financing_costs',
+            'project_inputs.ffe_costs', 'project_inputs.purchase_price', 'project_inputs.renovation',
+            'project_inputs.expansion', 'project_inputs.expansion_sf',
+            'project_inputs.construction_duration', 'economic_multipliers',
+        ],
+        'keys': ['construction_impact'],
+    },
+    'operations_narrative': {
+        'depends_on': [
+            'geography', 'project_inputs.proposed_use', 'project_inputs.proposed_use_sf',
+            'project_inputs.full_time_jobs', 'project_inputs.part_time_jobs',
+            'project_inputs.average_wage', 'project_inputs.occupancy', 'project_inputs.tables',
+            'project_inputs.annual_revenue', 'project_inputs.annual_expenses',
+            'project_inputs.rent_or_own', 'project_inputs.annual_rent', 'project_inputs.rent_per_sf',
+            'economic_multipliers', 'demographics', 'real_estate',
+        ],
+        'keys': ['operations_impact', 'ten_year_operations_projection'],
+    },
+    'community_impacts': {
+        'depends_on': [
+            'geography', 'project_inputs.project_name', 'project_inputs.property_address',
+            'project_inputs.proposed_use', 'project_inputs.current_use', 'project_inputs.notes',
+            'project_inputs.additional_notes', 'project_inputs.affordable_housing_units',
+            'project_inputs.public_space_sqft', 'project_inputs.parking_spaces',
+            'project_inputs.retail_units', 'demographics', 'real_estate',
+        ],
+        'keys': ['community_impacts'],
+    },
+    'sources': {
+        'depends_on': [
+            'geography', 'economic_multipliers.note', 'economic_multipliers.vintage',
+            'demographics.source', 'real_estate.source', 'fiscal_parameters.note',
+        ],
+        'keys': ['sources_html'],
+    },
+}
+
+
+def select_fields(llm_context: Dict[str, Any], paths: List[str]) -> Dict[str, Any]:
+    """Copy only the dotted paths a section depends on out of the context"""
+    subset = {}
+    for path in paths:
+        parts = path.split('.')
+        value = llm_context
+        for part in parts:
+            value = value.get(part) if isinstance(value, dict) else None
+        target = subset
+        for part in parts[:-1]:
+            target = target.setdefault(part, {})
+        target[parts[-1]] = value
+    return subset
+
+
+CATCH_ALL_SECTION = 'executive_summary'
+
+LISTED_INPUTS = {path.split('.', 1)[1] for spec in SECTIONS.values()
+                 for path in spec['depends_on'] if path.startswith('project_inputs.')}
+
+
+def section_fields(section: str, llm_context: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The context subset a section is generated from
+
+    CATCH_ALL_SECTION also receives any form input that no section lists,
+    so fields added to the form later are never silently dropped.
+    """
+    subset = select_fields(llm_context, SECTIONS[section]['depends_on'])
+    if section == CATCH_ALL_SECTION:
+        inputs = llm_context.get('project_inputs') or {}
+        unlisted = {key: value for key, value in inputs.items() if key not in LISTED_INPUTS}
+        if unlisted:
+            subset.setdefault('project_inputs', {}).update(unlisted)
+    return subset
+
+
+def section_hash(section: str, llm_context: Dict[str, Any]) -> str:
+    """Cache key for a section: its name and the hash of only the fields it reads"""
+    subset = section_fields(section, llm_context)
+    return hashlib.sha256(normalize_for_hash([section, subset]).encode('utf-8')).hexdigest()
+
+
+class SectionCache:
+    """Thread-safe LRU of generated section fragments, shared across sessions"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        return None
+
+    def put(self, key: str, fragment: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = fragment
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+section_cache = SectionCache()
+
+
+def generate_section(client: Any, section: str, llm_context: Dict[str, Any],
+                     project_name: str) -> Dict[str, Any]:
+    """
+    Generate one section with its own flow call
+
+    The flow receives the section's context subset in "in-0" and the section
+    name in "in-1", and returns a JSON object holding that section's keys.
+    """
+    subset = section_fields(section, llm_context)
+    payload = client.build_payload(subset, project_name)
+    payload['in-1'] = section
+    payload['user_id'] = f"{payload['user_id']}-{section}"
+
+    _, report_json = client.parse_output(client.call_flow(payload))
+    if not isinstance(report_json, dict):
+        raise ValueError(f"Section '{section}' did not return JSON")
+
+    return {key: report_json[key] for key in SECTIONS[section]['keys'] if key in report_json}
+
+
+def generate_report_sections(form_data: Dict[str, Any], geography: str = "homestead",
+                             client: Any = None, cache: Optional[SectionCache] = None,
+                             max_workers: int = len(SECTIONS)) -> Dict[str, Any]:
+    """
+    Section-parallel alternative to StackAIClient.run_analysis
+
+    Sections whose dependent context fields are unchanged are served from the
+    cache; the rest are dispatched concurrently. Editing a community-benefit
+    field therefore regenerates only the community impacts section.
+
+    Returns:
+        The run_analysis result shape ('success', 'report', 'report_json'),
+        plus 'sections' mapping each section to 'cached', 'generated' or
+        'failed', and 'errors' for failed sections.
+    """
+    from data_processor import data_processor
+
+    if client is None:
+        from stack_client import get_stack_client
+        client = get_stack_client()
+        if client is None:
+            return {'success': False, 'error': 'Stack.ai credentials not found in environment variables',
+                    'report': None}
+    cache = cache or section_cache
+
+    llm_context = data_processor.prepare_llm_context(form_data, geography)
+    project_name = form_data.get('project_name') or 'Economic Impact Analysis'
+
+    fragments = {}
+    status = {}
+    errors = {}
+    pending = {}
+    for section in SECTIONS:
+        key = section_hash(section, llm_context)
+        cached = cache.get(key)
+        if cached is not None:
+            fragments[section] = cached
+            status[section] = 'cached'
+        else:
+            pending[section] = key
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as pool:
+            futures = {
+                section: pool.submit(generate_section, client, section, llm_context, project_name)
+                for section in pending
+            }
+            for section, future in futures.items():
+                try:
+                    fragments[section] = future.result()
+                    cache.put(pending[section], fragments[section])
+                    status[section] = 'generated'
+                except Exception as e:
+                    errors[section] = str(e)
+                    status[section] = 'failed'
+
+    report_json = assemble_report(fragments)
+    result = {
+        'success': not errors,
+        'report': json.dumps(report_json, indent=2),
+        'report_json': report_json,
+        'sections': status,
+        'errors': errors,
+    }
+    if errors:
+        result['error'] = 'Some report sections could not be generated: ' + ', '.join(sorted(errors))
+    return result
+
+
+def assemble_report(fragments: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge section fragments into the single report JSON, in section order"""
+    report_json = {}
+    for section in SECTIONS:
+        report_json.update(fragments.get(section, {}))
+    return report_json
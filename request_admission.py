@@ -0,0 +1,267 @@
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Callable, Optional
+
+from artifact_store import normalize_for_hash
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter
+
+    Holds up to `capacity` tokens and refills at `rate` tokens per second.
+    Each admitted flow call consumes one token.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now"""
+        with self._cond:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Block until a token is available; returns False if `timeout` seconds pass first"""
+        deadline = None if timeout is None else self.clock() + timeout
+        with self._cond:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+                if deadline is not None:
+                    remaining = deadline - self.clock()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                self._cond.wait(wait)
+
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated errors
+
+    closed    -> calls pass through; `failure_threshold` consecutive failures opens it
+    open      -> calls are rejected until `reset_timeout` seconds have passed
+    half_open -> one trial call is let through; success closes, failure re-opens
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == 'open' and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+                self._trial_in_flight = False
+            if self.state == 'closed':
+                return True
+            if self.state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def release_trial(self):
+        """Give back a half-open trial slot when the call never reached the flow"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                self.state = 'open'
+                self.opened_at = self.clock()
+            self._trial_in_flight = False
+
+
+class _InFlight:
+    """A flow call shared by every caller that submitted the same request"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.waiters = 1
+
+
+class AdmissionController:
+    """
+    Admission layer in front of StackAIClient.run_analysis
+
+    - Identical in-flight requests (same geography and form data) are
+      coalesced: one flow call runs and every waiter receives its result.
+    - A token bucket enforces the flow's request quota.
+    - A circuit breaker rejects calls after repeated errors, returning the
+      fallback result if one is configured.
+    - Queue depth and wait times are exposed through stats().
+
+    Results keep the run_analysis shape ({'success': ..., 'report': ...}),
+    so callers do not need to change how they handle responses.
+    """
+
+    def __init__(self, client: Any, rate_per_minute: float = 10, burst: int = 3,
+                 failure_threshold: int = 3, reset_timeout: float = 60.0,
+                 admission_timeout: Optional[float] = 300.0,
+                 fallback: Optional[Callable[[Dict[str, Any], str], Dict[str, Any]]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.client = client
+        self.bucket = TokenBucket(rate_per_minute / 60.0, burst, clock)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout, clock)
+        self.admission_timeout = admission_timeout
+        self.fallback = fallback
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._waiting = 0
+        self._wait_times = deque(maxlen=1000)
+        self._counters = {'calls': 0, 'coalesced': 0, 'rejected': 0, 'rate_limited': 0, 'failures': 0}
+
+    @staticmethod
+    def request_key(form_data: Dict[str, Any], geography: str) -> str:
+        return hashlib.sha256(normalize_for_hash([geography, form_data]).encode('utf-8')).hexdigest()
+
+    def run_analysis(self, form_data: Dict[str, Any], geography: str = "homestead") -> Dict[str, Any]:
+        """Admission-controlled equivalent of StackAIClient.run_analysis"""
+        key = self.request_key(form_data, geography)
+
+        with self._lock:
+            entry = self._in_flight.get(key)
+            if entry is not None:
+                entry.waiters += 1
+                self._counters['coalesced'] += 1
+                leader = False
+            else:
+                entry = _InFlight()
+                self._in_flight[key] = entry
+                leader = True
+
+        if not leader:
+            entry.done.wait()
+            return entry.result
+
+        try:
+            entry.result = self._admit_and_call(form_data, geography)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            entry.done.set()
+        return entry.result
+
+    def _admit_and_call(self, form_data: Dict[str, Any], geography: str) -> Dict[str, Any]:
+        if not self.breaker.allow():
+            with self._lock:
+                self._counters['rejected'] += 1
+            return self._reject(form_data, geography,
+                                'Report service is temporarily unavailable after repeated errors. Please try again shortly.')
+
+        started = self.clock()
+        with self._lock:
+            self._waiting += 1
+        try:
+            admitted = self.bucket.acquire(self.admission_timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+                self._wait_times.append(self.clock() - started)
+
+        if not admitted:
+            with self._lock:
+                self._counters['rate_limited'] += 1
+            self.breaker.release_trial()
+            return self._reject(form_data, geography,
+                                'Too many report requests are queued. Please try again shortly.')
+
+        with self._lock:
+            self._counters['calls'] += 1
+        try:
+            result = self.client.run_analysis(form_data, geography)
+        except Exception as e:
+            result = {'success': False, 'error': f'Unexpected error: {str(e)}', 'report': None}
+
+        if result.get('success'):
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+            with self._lock:
+                self._counters['failures'] += 1
+        return result
+
+    def _reject(self, form_data: Dict[str, Any], geography: str, message: str) -> Dict[str, Any]:
+        if self.fallback is not None:
+            return self.fallback(form_data, geography)
+        return {'success': False, 'error': message, 'report': None}
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, wait times and breaker state for monitoring"""
+        with self._lock:
+            waits = sorted(self._wait_times)
+            stats = dict(self._counters)
+            stats['queue_depth'] = self._waiting
+            stats['in_flight'] = len(self._in_flight)
+            stats['waiters'] = sum(entry.waiters for entry in self._in_flight.values())
+
+        stats['breaker_state'] = self.breaker.state
+        stats['avg_wait_seconds'] = sum(waits) / len(waits) if waits else 0.0
+        stats['p95_wait_seconds'] = waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0
+        stats['max_wait_seconds'] = waits[-1] if waits else 0.0
+        return stats
+
+
+# Shared controller so every Streamlit session goes through the same limiter
+_admission_controller = None
+_admission_lock = threading.Lock()
+
+
+def get_admission_controller() -> Optional[AdmissionController]:
+    """
+    Returns the process-wide AdmissionController if Stack.ai credentials are
+    available, otherwise None. Quota is read from STACK_AI_RATE_PER_MINUTE
+    and STACK_AI_BURST.
+    """
+    global _admission_controller
+    with _admission_lock:
+        if _admission_controller is None:
+            from stack_client import get_stack_client
+            client = get_stack_client()
+            if client is None:
+                return None
+            _admission_controller = AdmissionController(
+                client,
+                rate_per_minute=float(os.getenv('STACK_AI_RATE_PER_MINUTE', '10')),
+                burst=int(os.getenv('STACK_AI_BURST', '3')),
+            )
+        return _admission_controller
@@ -0,0 +1,318 @@
+import argparse
+import csv
+import numbers
+import os
+import tempfile
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Tuple
+
+from economic_calculator import CALCULATOR_KEYS
+
+
+# Sheet / table layouts. Column lists are fixed up front so rows can be
+# written as they arrive without a first pass over the data.
+ID_COLUMNS = ['analysis_id', 'project_name', 'geography', 'proposed_use']
+
+RESULT_COLUMNS = [
+    'direct_jobs_construction', 'indirect_jobs_construction', 'total_jobs_construction',
+    'direct_jobs_permanent', 'indirect_jobs_permanent', 'total_jobs_permanent',
+    'direct_construction_income', 'total_construction_income',
+    'direct_permanent_income_annual', 'total_permanent_income_annual', 'total_permanent_income_period',
+    'direct_output', 'total_output', 'indirect_induced_output',
+    'annual_property_tax', 'total_property_tax_period', 'annual_sales_tax', 'total_sales_tax_period',
+    'annual_tax_revenue', 'total_tax_revenue_period', 'roi_ratio', 'payback_years', 'leverage_ratio',
+    'total_income_all_sources',
+    'affordable_housing_units', 'public_space_sqft', 'parking_spaces', 'retail_units',
+]
+
+YEARLY_COLUMNS = ['year', 'property_tax', 'sales_tax', 'tax_revenue', 'cumulative_tax_revenue',
+                  'permanent_income']
+
+TABLES = {
+    'Inputs': ID_COLUMNS + CALCULATOR_KEYS,
+    'Results': ID_COLUMNS[:2] + RESULT_COLUMNS,
+    'Yearly Projections': ID_COLUMNS[:2] + YEARLY_COLUMNS,
+}
+
+# Columns that get no SUM formula in the totals row: ratios and running totals are not summable
+TOTAL_EXCLUDED = {'roi_ratio', 'payback_years', 'leverage_ratio', 'year', 'cumulative_tax_revenue'}
+
+# Rows per XLSX worksheet, header included; longer tables continue on "<Table> (2)", ...
+XLSX_MAX_ROWS = 1_048_576
+
+
+def yearly_rows(results: Dict[str, Any], analysis_period: int) -> List[Dict[str, Any]]:
+    """Year-by-year projection of the calculator's annual tax and income figures"""
+    rows = []
+    cumulative = 0.0
+    for year in range(1, int(analysis_period or 0) + 1):
+        cumulative += results.get('annual_tax_revenue', 0)
+        rows.append({
+            'year': year,
+            'property_tax': results.get('annual_property_tax', 0),
+            'sales_tax': results.get('annual_sales_tax', 0),
+            'tax_revenue': results.get('annual_tax_revenue', 0),
+            'cumulative_tax_revenue': cumulative,
+            'permanent_income': results.get('total_permanent_income_annual', 0),
+        })
+    return rows
+
+
+def table_rows(record: Dict[str, Any]) -> Iterator[Tuple[str, List[Any]]]:
+    """
+    Split one analysis record into (table, row) pairs
+
+    A record holds 'inputs' (calculator form_data), 'results' (output of
+    calculate_economic_impact) and optionally 'yearly' rows; 'analysis_id'
+    is taken from the record or its inputs.
+    """
+    inputs = record.get('inputs', {})
+    results = dict(record.get('results', {}))
+    results.update(results.pop('community_benefits', None) or {})
+
+    ids = {
+        'analysis_id': record.get('analysis_id', inputs.get('analysis_id', '')),
+        'project_name': inputs.get('project_name') or 'Economic Impact Analysis',
+        'geography': inputs.get('geography', record.get('geography', '')),
+        'proposed_use': inputs.get('proposed_use', ''),
+    }
+
+    yield 'Inputs', [ids[c] for c in ID_COLUMNS] + [inputs.get(c) for c in CALCULATOR_KEYS]
+    yield 'Results', [ids[c] for c in ID_COLUMNS[:2]] + [results.get(c) for c in RESULT_COLUMNS]
+
+    yearly = record.get('yearly')
+    if yearly is None:
+        yearly = yearly_rows(results, inputs.get('analysis_period', 0))
+    for row in yearly:
+        yield 'Yearly Projections', [ids[c] for c in ID_COLUMNS[:2]] + [row.get(c) for c in YEARLY_COLUMNS]
+
+
+def _cell(value: Any) -> Any:
+    """Keep numbers numeric (numpy scalars included); stringify anything that is not a plain scalar"""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, numbers.Number):
+        return value.item() if hasattr(value, 'item') else value
+    return str(value)
+
+
+def export_xlsx(records: Iterable[Dict[str, Any]], target: Any,
+                max_rows: int = XLSX_MAX_ROWS) -> Dict[str, int]:
+    """
+    Stream analyses into an XLSX workbook, one sheet per table
+
+    Uses openpyxl's write-only mode, so memory stays flat regardless of
+    row count. Numeric cells keep their type, and each sheet ends with a
+    totals row of SUM formulas. A table that outgrows a worksheet's row
+    limit continues on "<Table> (2)", "<Table> (3)", ...; each of those
+    sheets has its own header and totals row.
+
+    Args:
+        records: Iterator of analysis records (see table_rows)
+        target: Path or binary file-like object
+        max_rows: Rows per worksheet, header and totals included
+
+    Returns:
+        Row counts per table, across all of its sheets
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+
+    workbook = Workbook(write_only=True)
+    bold = Font(bold=True)
+    # Data rows per sheet, leaving room for the header and totals rows
+    capacity = max_rows - 2
+
+    def open_sheet(name, part):
+        sheet = workbook.create_sheet(name if part == 1 else f"{name} ({part})")
+        header = []
+        for column in TABLES[name]:
+            cell = WriteOnlyCell(sheet, value=column)
+            cell.font = bold
+            header.append(cell)
+        sheet.append(header)
+        sheet.freeze_panes = 'A2'
+        return sheet
+
+    def close_sheet(name, sheet, rows):
+        if name == 'Inputs' or rows == 0:
+            return
+        last_row = rows + 1
+        totals = []
+        for index, column in enumerate(TABLES[name], start=1):
+            if index == 1:
+                cell = WriteOnlyCell(sheet, value='Total')
+            elif column in ID_COLUMNS or column in TOTAL_EXCLUDED:
+                cell = WriteOnlyCell(sheet, value=None)
+            else:
+                letter = get_column_letter(index)
+                cell = WriteOnlyCell(sheet, value=f"=SUM({letter}2:{letter}{last_row})")
+            cell.font = bold
+            totals.append(cell)
+        sheet.append(totals)
+
+    sheets = {name: open_sheet(name, 1) for name in TABLES}
+    parts = {name: 1 for name in TABLES}
+    sheet_rows = {name: 0 for name in TABLES}
+    counts = {name: 0 for name in TABLES}
+
+    for record in records:
+        for name, row in table_rows(record):
+            if sheet_rows[name] >= capacity:
+                close_sheet(name, sheets[name], sheet_rows[name])
+                parts[name] += 1
+                sheets[name] = open_sheet(name, parts[name])
+                sheet_rows[name] = 0
+            sheets[name].append([_cell(value) for value in row])
+            sheet_rows[name] += 1
+            counts[name] += 1
+
+    for name in TABLES:
+        close_sheet(name, sheets[name], sheet_rows[name])
+
+    workbook.save(target)
+    return counts
+
+
+def export_csv(records: Iterable[Dict[str, Any]], directory: str) -> Dict[str, str]:
+    """Stream analyses into one CSV per table; returns the file path of each table"""
+    os.makedirs(directory, exist_ok=True)
+    paths = {name: os.path.join(directory, f"{name.lower().replace(' ', '_')}.csv") for name in TABLES}
+    handles = {name: open(path, 'w', newline='', encoding='utf-8') for name, path in paths.items()}
+    try:
+        writers = {name: csv.writer(handle) for name, handle in handles.items()}
+        for name, columns in TABLES.items():
+            writers[name].writerow(columns)
+        for record in records:
+            for name, row in table_rows(record):
+                writers[name].writerow(row)
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return paths
+
+
+def export_parquet(records: Iterable[Dict[str, Any]], directory: str,
+                   batch_size: int = 10_000) -> Dict[str, str]:
+    """
+    Stream analyses into one Parquet file per table
+
+    Rows are buffered per table and flushed as a row group every
+    `batch_size` rows, so memory is bounded by the batch size.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(directory, exist_ok=True)
+    text_columns = set(ID_COLUMNS)
+    schemas = {
+        name: pa.schema([(c, pa.string() if c in text_columns else pa.float64()) for c in columns])
+        for name, columns in TABLES.items()
+    }
+    paths = {name: os.path.join(directory, f"{name.lower().replace(' ', '_')}.parquet") for name in TABLES}
+    writers = {name: pq.ParquetWriter(paths[name], schemas[name]) for name in TABLES}
+    buffers = {name: [] for name in TABLES}
+
+    def flush(name):
+        if not buffers[name]:
+            return
+        columns = list(zip(*buffers[name]))
+        arrays = []
+        for field, values in zip(schemas[name], columns):
+            if pa.types.is_string(field.type):
+                arrays.append(pa.array([None if v is None else str(v) for v in values], type=field.type))
+            else:
+                arrays.append(pa.array([_to_float(v) for v in values], type=field.type))
+        writers[name].write_table(pa.Table.from_arrays(arrays, schema=schemas[name]))
+        buffers[name].clear()
+
+    try:
+        for record in records:
+            for name, row in table_rows(record):
+                buffers[name].append(row)
+                if len(buffers[name]) >= batch_size:
+                    flush(name)
+        for name in TABLES:
+            flush(name)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return paths
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None and value != '' else None
+    except (TypeError, ValueError):
+        return None
+
+
+def xlsx_download(records: Iterable[Dict[str, Any]]):
+    """
+    Build a workbook for st.download_button
+
+    The workbook is written to a temporary file rather than built in
+    memory, and returned reopened for binary reading (a BufferedReader,
+    which st.download_button accepts). Streamlit still reads the finished
+    file into memory to serve it. The file is removed from disk right away
+    and disappears once the returned handle is closed.
+    """
+    with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as handle:
+        export_xlsx(records, handle)
+    download = open(handle.name, 'rb')
+    os.unlink(handle.name)
+    return download
+
+
+def records_from_history(history: Any = None, **filters) -> Iterator[Dict[str, Any]]:
+    """
+    Yield export records for stored analyses, one at a time
+
+    Stored form submissions are mapped onto calculator inputs for the Inputs
+    table. The stored calculator results are exported as they were saved;
+    they are only computed for analyses recorded without results.
+    """
+    from economic_calculator import calculate_economic_impact, form_to_calculator_inputs
+
+    if history is None:
+        from analysis_history import get_analysis_history
+        history = get_analysis_history()
+
+    for analysis in history.iter_analyses(**filters):
+        form_data = analysis['form_data']
+        geography = analysis['geography'] or 'homestead'
+        inputs = form_to_calculator_inputs(form_data, geography)
+        inputs.update({
+            'project_name': form_data.get('project_name'),
+            'proposed_use': form_data.get('proposed_use', ''),
+            'geography': geography,
+        })
+        results = analysis['calculator_results'] or calculate_economic_impact(inputs)
+        yield {'analysis_id': analysis['analysis_id'], 'inputs': inputs, 'results': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export stored analyses to XLSX, CSV or Parquet")
+    parser.add_argument('--format', choices=['xlsx', 'csv', 'parquet'], default='xlsx')
+    parser.add_argument('--out', required=True, help="Workbook path for xlsx, directory for csv/parquet")
+    parser.add_argument('--geography')
+    parser.add_argument('--proposed-use')
+    parser.add_argument('--since', help="ISO date, e.g. 2026-01-01")
+    args = parser.parse_args()
+
+    filters = {key: value for key, value in (('geography', args.geography),
+                                             ('proposed_use', args.proposed_use),
+                                             ('since', args.since)) if value}
+    records = records_from_history(**filters)
+
+    if args.format == 'xlsx':
+        print(export_xlsx(records, args.out))
+    elif args.format == 'csv':
+        print(export_csv(records, args.out))
+    else:
+        print(export_parquet(records, args.out))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,18 @@
 import requests
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import json
 
 
 class StackAIClient:
 
-    def __init__(self):
-        self.api_key = os.getenv('STACK_AI_API_KEY')
-        flow_id_input = os.getenv('STACK_AI_FLOW_ID')
-        self.base_url = "https://api.stack-ai.com/inference/v0/run"
+    def __init__(self, api_key: Optional[str] = None, flow_id: Optional[str] = None,
+                 base_url: Optional[str] = None):
+        # Explicit arguments take precedence over the environment, so tests and
+        # load runs can point a client at a local stand-in without touching it
+        self.api_key = api_key or os.getenv('STACK_AI_API_KEY')
+        flow_id_input = flow_id or os.getenv('STACK_AI_FLOW_ID')
+        self.base_url = base_url or os.getenv('STACK_AI_BASE_URL', "https://api.stack-ai.com/inference/v0/run")
 
         if not self.api_key or not flow_id_input:
             raise ValueError(
@@ -58,71 +61,17 @@ class StackAIClient:
             print("✗ fiscal_parameters is MISSING!")
         print("=" * 60)
 
-        # Prepare the payload with enriched context
-        payload = {
-            "in-0": json.dumps(llm_context),
-            "user_id": f"economic-impact-{form_data.get('project_name', 'unknown')}"
-        }
-
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        payload = self.build_payload(llm_context, form_data.get('project_name', 'unknown'))
 
         try:
             # Make the API call with org_id and flow_id
             print("Making request to Stack.ai...")
-            response = requests.post(
-                f"{self.base_url}/{self.org_id}/{self.flow_id}",
-                headers=headers,
-                json=payload,
-                timeout=180  # 3 minute timeout for LLM processing
-            )
-            print(f"Response received: status {response.status_code}")
-
-            response.raise_for_status()
-
-            # Parse response
-            result = response.json()
+            result = self.call_flow(payload)
             print(f"Full API response keys: {result.keys()}")
 
-            # Extract the output - Stack.ai returns outputs in 'outputs' dict
-            outputs = result.get('outputs', {})
-            print(f"Outputs keys: {outputs.keys() if outputs else 'No outputs'}")
-            output_text = outputs.get('out-0', '')
+            output_text, report_json = self.parse_output(result)
             print(f"Output text length: {len(output_text) if output_text else 0}")
 
-            # If output is JSON, try to parse and format it
-            report_json = None
-            if output_text:
-                try:
-                    output_data = json.loads(output_text)
-                    # Store the JSON data for structured display
-                    report_json = output_data
-                    
-                    # If it's a dict with HTML fields, combine them for text display
-                    if isinstance(output_data, dict):
-                        report_sections = []
-                        if output_data.get('executive_summary_html'):
-                            report_sections.append(
-                                output_data['executive_summary_html'])
-                        if output_data.get('tables_html'):
-                            report_sections.append(output_data['tables_html'])
-                        if output_data.get('why_this_matters_html'):
-                            report_sections.append(
-                                output_data['why_this_matters_html'])
-                        if output_data.get('sources_html'):
-                            report_sections.append(output_data['sources_html'])
-
-                        if report_sections:
-                            output_text = '\n\n'.join(report_sections)
-                        else:
-                            # If all sections are empty, keep the JSON string
-                            output_text = json.dumps(output_data, indent=2)
-                except json.JSONDecodeError:
-                    # Not JSON, use as-is
-                    pass
-
             return {
                 'success': True,
                 'report': output_text if output_text else
@@ -150,6 +99,73 @@ class StackAIClient:
                 'report': None
             }
 
+    def build_payload(self, llm_context: Dict[str, Any], project_name: str) -> Dict[str, Any]:
+        """Prepare the flow payload with enriched context"""
+        return {
+            "in-0": json.dumps(llm_context),
+            "user_id": f"economic-impact-{project_name}"
+        }
+
+    def call_flow(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST the payload to the flow and return the decoded response; raises on HTTP errors"""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        response = requests.post(
+            f"{self.base_url}/{self.org_id}/{self.flow_id}",
+            headers=headers,
+            json=payload,
+            timeout=180  # 3 minute timeout for LLM processing
+        )
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def parse_output(result: Dict[str, Any]):
+        """
+        Extract the report from a flow response
+
+        Returns:
+            (output_text, report_json) - report_json is None when the output is not JSON
+        """
+        # Extract the output - Stack.ai returns outputs in 'outputs' dict
+        outputs = result.get('outputs', {})
+        output_text = outputs.get('out-0', '')
+
+        # If output is JSON, try to parse and format it
+        report_json = None
+        if output_text:
+            try:
+                output_data = json.loads(output_text)
+                # Store the JSON data for structured display
+                report_json = output_data
+
+                # If it's a dict with HTML fields, combine them for text display
+                if isinstance(output_data, dict):
+                    report_sections = []
+                    if output_data.get('executive_summary_html'):
+                        report_sections.append(
+                            output_data['executive_summary_html'])
+                    if output_data.get('tables_html'):
+                        report_sections.append(output_data['tables_html'])
+                    if output_data.get('why_this_matters_html'):
+                        report_sections.append(
+                            output_data['why_this_matters_html'])
+                    if output_data.get('sources_html'):
+                        report_sections.append(output_data['sources_html'])
+
+                    if report_sections:
+                        output_text = '\n\n'.join(report_sections)
+                    else:
+                        # If all sections are empty, keep the JSON string
+                        output_text = json.dumps(output_data, indent=2)
+            except json.JSONDecodeError:
+                # Not JSON, use as-is
+                pass
+
+        return output_text, report_json
+
 
 # Create client instance
 def get_stack_client():
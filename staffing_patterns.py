@@ -0,0 +1,243 @@
+import csv
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# Lightcast staffing-pattern exports per geography
+STAFFING_PATTERN_FILES = {
+    'homestead': os.path.join(DATA_DIR, 'Homestead', 'Staffing Patterns.csv'),
+    'florida_statewide': os.path.join(DATA_DIR, 'Florida Statewide', 'Staffing Patterns.csv'),
+}
+
+# Hourly wage bands used to summarize occupation mixes: (label, lower bound)
+WAGE_BANDS = [
+    ('Under $15/hr', 0.0),
+    ('$15-$20/hr', 15.0),
+    ('$20-$30/hr', 20.0),
+    ('$30-$45/hr', 30.0),
+    ('$45+/hr', 45.0),
+]
+
+
+def _parse_float(value: Any) -> float:
+    try:
+        return float(str(value).replace('$', '').replace(',', '').replace('%', '').strip())
+    except ValueError:
+        return 0.0
+
+
+class StaffingPatterns:
+    """
+    Industry x occupation staffing matrix for one geography
+
+    Each row is a NAICS industry and holds the share of its jobs in each SOC
+    occupation (rows sum to 1). The matrix is stored sparse: an industry
+    employs a few dozen of the ~800 SOC codes. industry_employment holds
+    each industry's total jobs and weights the economy-wide mix.
+    """
+
+    def __init__(self, geography: str, naics_codes: List[str], soc_codes: List[str],
+                 occupation_titles: List[str], median_wages: np.ndarray, matrix: sparse.csr_matrix,
+                 industry_employment: Optional[np.ndarray] = None):
+        self.geography = geography
+        self.naics_codes = naics_codes
+        self.soc_codes = soc_codes
+        self.occupation_titles = occupation_titles
+        self.median_wages = median_wages
+        self.matrix = matrix
+        self.naics_index = {naics: i for i, naics in enumerate(naics_codes)}
+        if industry_employment is None:
+            industry_employment = np.ones(len(naics_codes))
+        self.industry_employment = np.asarray(industry_employment, dtype=float)
+
+        # Rows are per-industry shares; weighting them by each industry's
+        # employment gives the region's actual occupation mix, where a small
+        # industry counts for as little as its headcount
+        totals = self.industry_employment @ matrix
+        totals = np.asarray(totals).ravel()
+        self.average_row = totals / totals.sum() if totals.sum() > 0 else totals
+
+        band_bounds = np.array([lower for _, lower in WAGE_BANDS])
+        self.wage_band_index = np.searchsorted(band_bounds, median_wages, side='right') - 1
+        self._band_matrix = sparse.csr_matrix(
+            (np.ones(len(soc_codes)), (np.arange(len(soc_codes)), np.maximum(self.wage_band_index, 0))),
+            shape=(len(soc_codes), len(WAGE_BANDS)))
+
+        self.row = lru_cache(maxsize=1024)(self._row)
+
+    @classmethod
+    def from_csv(cls, path: str, geography: str) -> 'StaffingPatterns':
+        """
+        Load a staffing-pattern export
+
+        Expected columns: NAICS, SOC, Occupation, Employment (or Share) and
+        Median Hourly Wage. Employment counts are normalized per industry;
+        their industry totals weight the economy-wide mix (with Share
+        columns every industry weighs the same).
+        """
+        naics_index = {}
+        soc_index = {}
+        titles = []
+        wages = []
+        rows, cols, values = [], [], []
+
+        with open(path, newline='', encoding='utf-8-sig') as handle:
+            for record in csv.DictReader(handle):
+                naics = (record.get('NAICS') or '').strip()
+                soc = (record.get('SOC') or '').strip()
+                if not naics or not soc:
+                    continue
+                amount = _parse_float(record.get('Employment', record.get('Share', 0)))
+                if amount <= 0:
+                    continue
+
+                if soc not in soc_index:
+                    soc_index[soc] = len(soc_index)
+                    titles.append((record.get('Occupation') or soc).strip())
+                    wages.append(_parse_float(record.get('Median Hourly Wage', 0)))
+                rows.append(naics_index.setdefault(naics, len(naics_index)))
+                cols.append(soc_index[soc])
+                values.append(amount)
+
+        matrix = sparse.csr_matrix((values, (rows, cols)), shape=(len(naics_index), len(soc_index)))
+        row_totals = np.asarray(matrix.sum(axis=1)).ravel()
+        matrix = sparse.diags(1.0 / np.where(row_totals > 0, row_totals, 1.0)) @ matrix
+
+        return cls(geography, list(naics_index), list(soc_index), titles,
+                   np.array(wages, dtype=float), matrix.tocsr(), row_totals)
+
+    def _row(self, naics: str) -> np.ndarray:
+        """
+        Occupation shares for an industry
+
+        Falls back to the employment-weighted mix of all industries sharing
+        the longest matching NAICS prefix (e.g. 7225xx for an unlisted
+        722515), then to the economy-wide mix.
+        """
+        naics = str(naics)
+        if naics in self.naics_index:
+            return self.matrix.getrow(self.naics_index[naics]).toarray().ravel()
+
+        for length in range(len(naics) - 1, 1, -1):
+            prefix = naics[:length]
+            matches = [i for code, i in self.naics_index.items() if code.startswith(prefix)]
+            if matches:
+                weights = self.industry_employment[matches]
+                if weights.sum() <= 0:
+                    weights = np.ones(len(matches))
+                mix = np.asarray(weights @ self.matrix[matches]).ravel()
+                return mix / weights.sum()
+
+        return self.average_row
+
+    def industry_mix_matrix(self, job_mixes: List[Dict[str, float]]) -> sparse.csr_matrix:
+        """
+        Projects x occupations job counts for many projects in one product
+
+        Args:
+            job_mixes: One {naics: jobs} dict per project
+
+        NAICS codes present in the matrix go through a single sparse
+        (projects x industries) @ (industries x occupations) product; codes
+        that need a fallback row go through a second product against their
+        cached per-NAICS rows.
+        """
+        rows, cols, values = [], [], []
+        fallback_index = {}
+        fallback_rows, fallback_cols, fallback_values = [], [], []
+        for p, mix in enumerate(job_mixes):
+            for naics, jobs in mix.items():
+                naics = str(naics)
+                index = self.naics_index.get(naics)
+                if index is not None:
+                    rows.append(p)
+                    cols.append(index)
+                    values.append(jobs)
+                elif jobs:
+                    fallback_rows.append(p)
+                    fallback_cols.append(fallback_index.setdefault(naics, len(fallback_index)))
+                    fallback_values.append(jobs)
+
+        weights = sparse.csr_matrix((values, (rows, cols)), shape=(len(job_mixes), len(self.naics_codes)))
+        result = weights @ self.matrix
+        if fallback_index:
+            fallback_weights = sparse.csr_matrix((fallback_values, (fallback_rows, fallback_cols)),
+                                                 shape=(len(job_mixes), len(fallback_index)))
+            fallback_matrix = sparse.csr_matrix(np.vstack([self.row(naics) for naics in fallback_index]))
+            result = result + fallback_weights @ fallback_matrix
+        return result.tocsr()
+
+    def wage_bands(self, occupation_jobs: sparse.spmatrix) -> np.ndarray:
+        """Collapse projects x occupations job counts into projects x WAGE_BANDS"""
+        return np.asarray((occupation_jobs @ self._band_matrix).todense())
+
+    def breakdown(self, naics: str, direct_jobs: float, indirect_jobs: float = 0.0,
+                  indirect_mix: Optional[Dict[str, float]] = None, top: int = 15) -> Dict[str, Any]:
+        """
+        Occupation and wage-band breakdown for one project
+
+        Direct jobs follow the project's own industry. Indirect jobs follow
+        `indirect_mix` ({naics: share}) when given, otherwise the
+        economy-wide staffing mix.
+
+        Returns:
+            {'occupations': [{'soc', 'title', 'median_hourly_wage', 'jobs'}, ...] (largest first),
+             'wage_bands': [{'band', 'jobs'}, ...]}
+        """
+        jobs = direct_jobs * self.row(str(naics))
+        if indirect_jobs:
+            if indirect_mix:
+                total_share = sum(indirect_mix.values()) or 1.0
+                for code, share in indirect_mix.items():
+                    jobs = jobs + indirect_jobs * share / total_share * self.row(str(code))
+            else:
+                jobs = jobs + indirect_jobs * self.average_row
+
+        order = np.argsort(jobs)[::-1]
+        occupations = [
+            {'soc': self.soc_codes[i], 'title': self.occupation_titles[i],
+             'median_hourly_wage': float(self.median_wages[i]), 'jobs': round(float(jobs[i]), 2)}
+            for i in order[:top] if jobs[i] > 0
+        ]
+        bands = self.wage_bands(sparse.csr_matrix(jobs))[0]
+        return {
+            'occupations': occupations,
+            'wage_bands': [{'band': label, 'jobs': round(float(count), 2)}
+                           for (label, _), count in zip(WAGE_BANDS, bands)],
+        }
+
+
+def breakdown_for_results(calculator_results: Dict[str, Any], naics: str,
+                          geography: str = "homestead", **options) -> Dict[str, Any]:
+    """Occupation breakdown of the permanent jobs from calculate_economic_impact"""
+    patterns = load_staffing_patterns(geography)
+    return patterns.breakdown(naics, calculator_results.get('direct_jobs_permanent', 0),
+                              calculator_results.get('indirect_jobs_permanent', 0), **options)
+
+
+_patterns_by_geography = {}
+_patterns_lock = threading.Lock()
+
+
+def load_staffing_patterns(geography: str = "homestead") -> StaffingPatterns:
+    """
+    Staffing patterns for a geography, loaded once per process
+
+    Raises:
+        FileNotFoundError: if no staffing-pattern export is installed for the geography
+    """
+    with _patterns_lock:
+        if geography not in _patterns_by_geography:
+            path = STAFFING_PATTERN_FILES.get(geography)
+            if path is None or not os.path.exists(path):
+                raise FileNotFoundError(
+                    f"No staffing-pattern data for '{geography}'. Expected a Lightcast export at {path}")
+            _patterns_by_geography[geography] = StaffingPatterns.from_csv(path, geography)
+        return _patterns_by_geography[geography]
@@ -0,0 +1,262 @@
+import os
+from typing import Dict, Any, List, Optional, Iterable
+
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+from economic_calculator import CALCULATOR_KEYS, MULTIPLIER_KEYS, form_to_calculator_inputs
+
+
+# Field specs: dtype is 'float', 'int' or 'str'; a field with no default is
+# left empty when missing. A schema's optional 'fill' step then completes the
+# coerced frame, and rules are checked last.
+FORM_SCHEMA = {
+    'fields': {
+        'project_name': {'dtype': 'str', 'default': 'Economic Impact Analysis'},
+        'property_address': {'dtype': 'str', 'default': ''},
+        'proposed_use': {'dtype': 'str', 'required': True},
+        'current_taxable_value': {'dtype': 'float', 'default': 0, 'min': 0},
+        'parcel_size': {'dtype': 'float', 'default': 0, 'min': 0},
+        'building_size': {'dtype': 'float', 'default': 0, 'min': 0},
+        'proposed_use_sf': {'dtype': 'float', 'default': 0, 'min': 0},
+        'purchase_price': {'dtype': 'float', 'default': 0, 'min': 0},
+        'total_development_costs': {'dtype': 'float', 'default': 0, 'min': 0},
+        'hard_costs': {'dtype': 'float', 'default': 0, 'min': 0},
+        'soft_costs': {'dtype': 'float', 'default': 0, 'min': 0},
+        'financing_costs': {'dtype': 'float', 'default': 0, 'min': 0},
+        'ffe_costs': {'dtype': 'float', 'default': 0, 'min': 0},
+        'construction_duration': {'dtype': 'int', 'default': 0, 'min': 0},
+        'full_time_jobs': {'dtype': 'int', 'default': 0, 'min': 0},
+        'part_time_jobs': {'dtype': 'int', 'default': 0, 'min': 0},
+        'average_wage': {'dtype': 'float', 'default': 0, 'min': 0},
+        'occupancy': {'dtype': 'float', 'default': 0, 'min': 0},
+        'annual_revenue': {'dtype': 'float', 'default': 0, 'min': 0},
+        'annual_expenses': {'dtype': 'float', 'default': 0, 'min': 0},
+        'annual_rent': {'dtype': 'float', 'default': 0, 'min': 0},
+        'rent_per_sf': {'dtype': 'float', 'default': 0, 'min': 0},
+        'funding_request': {'dtype': 'float', 'default': 0, 'min': 0},
+    },
+    # (fields, check returning a boolean Series of failing rows, message)
+    'row_rules': [
+        (['total_development_costs', 'hard_costs'],
+         lambda df: ~((df['total_development_costs'] > 0) | (df['hard_costs'] > 0)),
+         'At least one of Total Development Costs or Hard Costs must be greater than 0'),
+    ],
+}
+
+# Calculator inputs that are never defaulted to a constant: when missing they
+# come from form_to_calculator_inputs for the row's geography and proposed use
+DERIVED_CALCULATOR_KEYS = ['analysis_period', 'property_tax_rate', 'sales_tax_rate',
+                           'local_procurement_pct', *MULTIPLIER_KEYS]
+
+
+def fill_calculator_inputs(data: pd.DataFrame, processor: Any = None) -> pd.DataFrame:
+    """
+    Fill missing DERIVED_CALCULATOR_KEYS the way a form submission is mapped
+
+    Rates, procurement share and analysis period come from the row's
+    geography; multipliers also need its proposed use, so rows without one
+    keep empty multipliers and are rejected by CALCULATOR_SCHEMA's rules.
+    """
+    missing_rows = data[DERIVED_CALCULATOR_KEYS].isna().any(axis=1)
+    if not missing_rows.any():
+        return data
+
+    uses = data['proposed_use'].astype('string')
+    groups = pd.DataFrame({'geography': data['geography'], 'proposed_use': uses})[missing_rows]
+    for (geography, proposed_use), group in groups.groupby(['geography', 'proposed_use'], dropna=False):
+        has_use = not pd.isna(proposed_use)
+        derived = form_to_calculator_inputs({'proposed_use': proposed_use if has_use else None},
+                                            geography, processor)
+        rows = data.index.isin(group.index)
+        for key in DERIVED_CALCULATOR_KEYS:
+            if has_use or key not in MULTIPLIER_KEYS:
+                data.loc[rows, key] = data.loc[rows, key].fillna(derived[key])
+    return data
+
+
+CALCULATOR_SCHEMA = {
+    'fields': {
+        'project_name': {'dtype': 'str', 'default': 'Economic Impact Analysis'},
+        'geography': {'dtype': 'str', 'default': 'homestead'},
+        'proposed_use': {'dtype': 'str'},
+        **{key: {'dtype': 'float', 'default': 0, 'min': 0} for key in CALCULATOR_KEYS},
+        **{key: {'dtype': 'float', 'min': 0} for key in DERIVED_CALCULATOR_KEYS},
+        'total_investment': {'dtype': 'float', 'required': True, 'min': 0},
+        'affordable_housing_units': {'dtype': 'int', 'default': 0, 'min': 0},
+        'public_space_sqft': {'dtype': 'float', 'default': 0, 'min': 0},
+        'parking_spaces': {'dtype': 'int', 'default': 0, 'min': 0},
+        'retail_units': {'dtype': 'int', 'default': 0, 'min': 0},
+    },
+    'fill': fill_calculator_inputs,
+    'row_rules': [
+        (MULTIPLIER_KEYS, lambda df: df[MULTIPLIER_KEYS].isna().any(axis=1),
+         'Proposed Use is required when the multipliers are not given'),
+        (['employment_multiplier', 'income_multiplier', 'output_multiplier'],
+         lambda df: (df['employment_multiplier'] < 1) | (df['income_multiplier'] < 1) | (df['output_multiplier'] < 1),
+         'Multipliers must be at least 1.0'),
+        (['analysis_period'], lambda df: df['analysis_period'] <= 0, 'Analysis period must be greater than 0'),
+    ],
+}
+
+DISPLAY_NAMES = {
+    'proposed_use': 'Proposed Use',
+    'total_development_costs': 'Total Development Costs',
+    'hard_costs': 'Hard Costs',
+    'full_time_jobs': 'Full Time Jobs',
+    'part_time_jobs': 'Part Time Jobs',
+}
+
+
+def _label(field: str) -> str:
+    return DISPLAY_NAMES.get(field, field.replace('_', ' ').title())
+
+
+def _to_numeric(series: pd.Series) -> pd.Series:
+    """Coerce a column to numbers, accepting text like "$1,250,000" or "15%" """
+    if not is_numeric_dtype(series):
+        series = series.astype('string').str.replace(r'[$,%\s]', '', regex=True).replace('', pd.NA)
+    return pd.to_numeric(series, errors='coerce')
+
+
+class ValidationResult:
+    """Outcome of validating a batch of submissions"""
+
+    def __init__(self, data: pd.DataFrame, errors: pd.DataFrame):
+        self.data = data
+        self.errors = errors
+        self.invalid_mask = data.index.isin(errors['row'])
+
+    @property
+    def valid(self) -> pd.DataFrame:
+        """Coerced, default-filled rows with no errors"""
+        return self.data[~self.invalid_mask]
+
+    @property
+    def invalid(self) -> pd.DataFrame:
+        return self.data[self.invalid_mask]
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Valid rows as form_data dicts, ready for prepare_llm_context or the calculator"""
+        return self.valid.to_dict(orient='records')
+
+    def error_report(self) -> Dict[Any, List[str]]:
+        """Messages per rejected row"""
+        return self.errors.groupby('row')['error'].apply(list).to_dict()
+
+
+def validate_submissions(submissions: pd.DataFrame, schema: Optional[Dict[str, Any]] = None) -> ValidationResult:
+    """
+    Validate a whole DataFrame of submissions in one columnar pass
+
+    Each field is coerced to its type, missing values are filled with the
+    field's default (or by the schema's fill step), and every rule is
+    evaluated as a vectorized mask over the column. Rows with any error are rejected before LLM or PDF work is
+    queued; the error report lists every problem per row, not just the first.
+
+    Args:
+        submissions: One row per submission; columns use form_data keys
+        schema: FORM_SCHEMA (default) for form submissions or
+            CALCULATOR_SCHEMA for calculate_economic_impact inputs
+
+    Returns:
+        ValidationResult with the coerced data, valid/invalid splits and
+        an errors frame of (row, field, error)
+    """
+    schema = schema or FORM_SCHEMA
+    data = submissions.copy()
+    error_frames = []
+
+    def add_errors(mask: pd.Series, field: str, message: str):
+        if mask.any():
+            rows = data.index[mask.to_numpy()]
+            error_frames.append(pd.DataFrame({'row': rows, 'field': field, 'error': message}))
+
+    for field, spec in schema['fields'].items():
+        required = spec.get('required', False)
+        default = spec.get('default')
+
+        if field not in data.columns:
+            if required:
+                add_errors(pd.Series(True, index=data.index), field, f"{_label(field)} is required")
+            data[field] = default if default is not None else pd.NA
+            if required:
+                continue
+
+        column = data[field]
+        if spec['dtype'] == 'str':
+            text = column.astype('string').str.strip()
+            missing = text.isna() | (text == '')
+            if required:
+                add_errors(missing, field, f"{_label(field)} is required")
+            data[field] = text.mask(missing, default if default is not None else pd.NA)
+            continue
+
+        numbers = _to_numeric(column)
+        blank = column.isna()
+        if not is_numeric_dtype(column):
+            blank |= column.astype('string').str.strip().fillna('') == ''
+        add_errors(numbers.isna() & ~blank, field, f"{_label(field)} must be a number")
+        missing = numbers.isna()
+        if required:
+            add_errors(blank, field, f"{_label(field)} is required")
+        if default is not None:
+            numbers = numbers.fillna(default)
+
+        if 'min' in spec:
+            minimum = spec['min']
+            message = f"{_label(field)} cannot be negative" if minimum == 0 else f"{_label(field)} must be at least {minimum}"
+            add_errors(numbers < minimum, field, message)
+        if 'max' in spec:
+            add_errors(numbers > spec['max'], field, f"{_label(field)} must be at most {spec['max']}")
+
+        if spec['dtype'] == 'int':
+            numbers = numbers.round().astype('Int64') if missing.any() and default is None else numbers.round().astype('int64')
+        data[field] = numbers
+
+    if 'fill' in schema:
+        data = schema['fill'](data)
+
+    for fields, check, message in schema.get('row_rules', []):
+        if all(field in data.columns for field in fields):
+            add_errors(check(data).fillna(False).astype(bool), ', '.join(fields), message)
+
+    errors = (pd.concat(error_frames, ignore_index=True) if error_frames
+              else pd.DataFrame({'row': pd.Series(dtype=data.index.dtype), 'field': pd.Series(dtype=str),
+                                 'error': pd.Series(dtype=str)}))
+    return ValidationResult(data, errors)
+
+
+def validate_records(records: List[Dict[str, Any]], schema: Optional[Dict[str, Any]] = None) -> ValidationResult:
+    """Validate a list of form_data dicts"""
+    return validate_submissions(pd.DataFrame.from_records(records), schema)
+
+
+def validate_ingested(ingested: Iterable[Dict[str, Any]], defaults: Optional[Dict[str, Any]] = None,
+                      per_submission: Optional[Dict[str, Dict[str, Any]]] = None,
+                      schema: Optional[Dict[str, Any]] = None) -> ValidationResult:
+    """
+    Validate the output of ProformaIngestor.ingest_folder
+
+    Each {'submission', 'fields', 'errors'} record becomes one row, indexed
+    by submission name: the submission name as project_name, `defaults`,
+    then that submission's entry in `per_submission`, then the extracted
+    fields. Pro-formas carry no
+    Proposed Use, so supply it through one of those, e.g.
+    defaults={'proposed_use': 'restaurant'}; rows without it are rejected.
+    Files the ingestor could not read are reported on their submission's row.
+    """
+    records = list(ingested)
+    per_submission = per_submission or {}
+    rows = [{'project_name': os.path.splitext(record['submission'])[0], **(defaults or {}),
+             **per_submission.get(record['submission'], {}), **record['fields']}
+            for record in records]
+    frame = pd.DataFrame.from_records(rows, index=pd.Index([record['submission'] for record in records]))
+    result = validate_submissions(frame, schema)
+
+    read_errors = [(record['submission'], 'documents', error) for record in records for error in record['errors']]
+    if not read_errors:
+        return result
+    errors = pd.concat([result.errors, pd.DataFrame(read_errors, columns=['row', 'field', 'error'])],
+                       ignore_index=True)
+    return ValidationResult(result.data, errors)